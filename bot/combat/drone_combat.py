@@ -3,15 +3,10 @@ from typing import TYPE_CHECKING, Union
 
 import numpy as np
 from ares.behaviors.combat import CombatManeuver
+from ares.behaviors.combat.group import GroupUseAbility
 from ares.behaviors.combat.individual import ShootTargetInRange, UseAbility
 from ares.managers.manager_mediator import ManagerMediator
-from cython_extensions import (
-    cy_attack_ready,
-    cy_closest_to,
-    cy_distance_to_squared,
-    cy_center,
-    cy_towards,
-)
+from cython_extensions import cy_attack_ready, cy_center, cy_closest_to
 from cython_extensions.dijkstra import DijkstraPathing
 from sc2.ids.ability_id import AbilityId
 from sc2.position import Point2
@@ -22,6 +17,7 @@ from src.ares.consts import ALL_STRUCTURES, UnitTreeQueryType
 
 from bot.combat.base_combat import BaseCombat
 from bot.consts import COMMON_UNIT_IGNORE_TYPES, SUPPLY_TYPES
+from bot.mineral_patch_index import MineralPatchIndex
 
 if TYPE_CHECKING:
     from ares import AresBot
@@ -48,7 +44,16 @@ class DroneCombat(BaseCombat):
     mediator: ManagerMediator
 
     def execute(self, units: Union[list[Unit], Units], **kwargs) -> None:
-        """Execute the behavior."""
+        """Execute the behavior.
+
+        Per drone state (returning cargo, fleeing, safe, near target) is
+        computed for the whole group at once. Drones with nothing to react to
+        are moved to the target with one grouped command, the rest get an
+        individual maneuver.
+        """
+        if not units:
+            return
+
         retreat_pathing: DijkstraPathing = kwargs["retreat_pathing"]
         grid: np.ndarray = kwargs["grid"]
         target: Point2 = kwargs["target"]
@@ -64,93 +69,99 @@ class DroneCombat(BaseCombat):
             return_as_dict=True,
         )
 
-        close_mf: Unit = cy_closest_to(self.ai.start_location, self.ai.mineral_field)
-        for unit in units:
-            if (
-                unit.is_carrying_resource
-                and cy_distance_to_squared(unit.position, self.ai.start_location)
-                < 250.0
-            ):
-                unit.return_resource()
-                continue
-
-            unit_pos: Point2 = unit.position
-            close_to_target: bool = cy_distance_to_squared(unit_pos, target) < 9.0
+        drones: list[Unit] = list(units)
+        close_enemies: list[Units] = []
+        only_enemy_units: list[Units] = []
+        for unit in drones:
             close_enemy: Units = enemy_ground[unit.tag].filter(
                 lambda u: u.type_id not in COMMON_UNIT_IGNORE_TYPES and not u.is_memory
             )
-            only_enemy_units: Units = close_enemy.filter(
-                lambda u: u.type_id not in ALL_STRUCTURES or u.type_id in SUPPLY_TYPES
-            )
-            fleeing: bool = (
-                unit.health <= flee_at_health or len(only_enemy_units) > len(units) * 4
+            close_enemies.append(close_enemy)
+            only_enemy_units.append(
+                close_enemy.filter(
+                    lambda u: u.type_id not in ALL_STRUCTURES
+                    or u.type_id in SUPPLY_TYPES
+                )
             )
-            safe: bool = self.mediator.is_position_safe(grid=grid, position=unit_pos)
-            retreat_path = retreat_pathing.get_path(unit_pos, 5)
+
+        positions: np.ndarray = np.array([u.position for u in drones], dtype=float)
+        returning: np.ndarray = np.array(
+            [u.is_carrying_resource for u in drones], dtype=bool
+        ) & (self._distances_sq(positions, self.ai.start_location) < 250.0)
+        close_to_target: np.ndarray = self._distances_sq(positions, target) < 9.0
+        num_close_enemy: np.ndarray = np.array([len(e) for e in close_enemies])
+        num_only_enemy: np.ndarray = np.array([len(e) for e in only_enemy_units])
+        fleeing: np.ndarray = (
+            np.array([u.health for u in drones]) <= flee_at_health
+        ) | (num_only_enemy > len(units) * 4)
+        safe: np.ndarray = self.ai.position_safety.are_positions_safe(grid, positions)
+        # nothing to react to, these drones just head to the target
+        move_to_target: np.ndarray = ~returning & np.where(
+            fleeing, safe & (num_only_enemy == 0), num_close_enemy == 0
+        )
+
+        def _retreat_to(_unit_pos: Point2) -> Point2:
+            retreat_path = retreat_pathing.get_path(_unit_pos, 5)
             if len(retreat_path) > 1:
-                retreat_to = Point2(retreat_path[-1])
-            else:
-                retreat_to = self.ai.start_location
+                return Point2(retreat_path[-1])
+            return self.ai.start_location
+
+        mineral_patches: MineralPatchIndex = self.ai.mineral_patch_index
+        for i in np.flatnonzero(~returning & ~move_to_target):
+            unit: Unit = drones[i]
+            unit_pos: Point2 = unit.position
+            close_enemy: Units = close_enemies[i]
+            only_enemies: Units = only_enemy_units[i]
 
             harass_maneuver: CombatManeuver = CombatManeuver()
-            if fleeing:
-                if not safe:
+            if fleeing[i]:
+                if not safe[i]:
                     harass_maneuver.add(
-                        UseAbility(AbilityId.MOVE_MOVE, unit, retreat_to)
+                        UseAbility(AbilityId.MOVE_MOVE, unit, _retreat_to(unit_pos))
                     )
-                elif only_enemy_units:
+                else:
                     harass_maneuver.add(
                         UseAbility(
                             AbilityId.MOVE_MOVE,
                             unit,
-                            cy_closest_to(unit_pos, only_enemy_units).position,
+                            cy_closest_to(unit_pos, only_enemies).position,
                         )
                     )
-                else:
-                    harass_maneuver.add(UseAbility(AbilityId.MOVE_MOVE, unit, target))
-            elif close_enemy:
-                if only_enemy_units and not ramp_walled_off:
-                    target_enemy: Unit = cy_closest_to(unit_pos, only_enemy_units)
+            else:
+                if only_enemies and not ramp_walled_off:
+                    target_enemy: Unit = cy_closest_to(unit_pos, only_enemies)
                 else:
                     target_enemy: Unit = cy_closest_to(unit_pos, close_enemy)
 
                 attack_ready: bool = cy_attack_ready(self.ai, unit, target_enemy)
-                harass_maneuver.add(ShootTargetInRange(unit, only_enemy_units))
-                if (close_enemy and not only_enemy_units) or ramp_walled_off:
+                harass_maneuver.add(ShootTargetInRange(unit, only_enemies))
+                if not only_enemies or ramp_walled_off:
                     harass_maneuver.add(ShootTargetInRange(unit, close_enemy))
 
-                if not attack_ready and not safe:
+                if not attack_ready and not safe[i]:
                     if mineral_walk:
                         pos_of_enemy: Point2 = Point2(cy_center(close_enemy))
-                        # draw a line back behind the worker, and find a mf
-                        position = cy_towards(pos_of_enemy, unit_pos, 6.0)
-                        target_mfs = [
-                            mf
-                            for mf in self.ai.mineral_field
-                            if cy_distance_to_squared(mf.position, position)
-                            < cy_distance_to_squared(mf.position, pos_of_enemy)
-                            and cy_distance_to_squared(mf.position, unit_pos) > 16.0
-                        ]
-                        if target_mfs:
-                            close_mf: Unit = cy_closest_to(
-                                position=unit_pos, units=target_mfs
-                            )
+                        # find a mf behind the worker, away from the enemy
+                        close_mf: Unit | None = mineral_patches.patch_behind(
+                            unit_pos, pos_of_enemy
+                        )
+                        if close_mf is None:
+                            close_mf = mineral_patches.main_patch
                         harass_maneuver.add(
                             UseAbility(AbilityId.HARVEST_GATHER_DRONE, unit, close_mf)
                         )
                     else:
                         harass_maneuver.add(
-                            UseAbility(AbilityId.MOVE_MOVE, unit, retreat_to)
+                            UseAbility(AbilityId.MOVE_MOVE, unit, _retreat_to(unit_pos))
                         )
 
                 else:
                     # try not to chase one lone enemy
                     if (
-                        only_enemy_units
-                        and len(only_enemy_units) == 1
-                        and only_enemy_units[0].type_id not in SUPPLY_TYPES
+                        len(only_enemies) == 1
+                        and only_enemies[0].type_id not in SUPPLY_TYPES
                     ):
-                        if not close_to_target:
+                        if not close_to_target[i]:
                             harass_maneuver.add(
                                 UseAbility(AbilityId.MOVE_MOVE, unit, target)
                             )
@@ -165,3 +176,21 @@ class DroneCombat(BaseCombat):
 
             harass_maneuver.add(UseAbility(AbilityId.MOVE_MOVE, unit, target))
             self.ai.register_behavior(harass_maneuver)
+
+        for i in np.flatnonzero(returning):
+            drones[i].return_resource()
+
+        if move_to_target.any():
+            group: list[Unit] = [drones[i] for i in np.flatnonzero(move_to_target)]
+            group_maneuver: CombatManeuver = CombatManeuver()
+            group_maneuver.add(
+                GroupUseAbility(
+                    AbilityId.MOVE_MOVE, group, {u.tag for u in group}, target
+                )
+            )
+            self.ai.register_behavior(group_maneuver)
+
+    @staticmethod
+    def _distances_sq(positions: np.ndarray, point: Point2) -> np.ndarray:
+        diff: np.ndarray = positions - np.array((point[0], point[1]), dtype=float)
+        return np.einsum("ij,ij->i", diff, diff)
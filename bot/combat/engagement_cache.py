@@ -0,0 +1,91 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from ares.consts import EngagementResult
+from sc2.unit import Unit
+from sc2.units import Units
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+EngagementKey = tuple[frozenset[int], frozenset[int], int, int]
+
+
+@dataclass
+class EngagementCache:
+    """Reuse `mediator.can_win_fight` results for fights that haven't changed.
+
+    A fight is identified by the tags on both sides plus each side's
+    combined health and shields, bucketed coarsely so a few points of
+    damage don't count as a new fight. Results are reused for
+    `valid_for` game loops.
+
+    Called from `bot/main.py`
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    valid_for : int
+        Game loops a result can be reused for
+    health_bucket : float
+        Width of a health bucket, as a fraction of a side's max health
+    """
+
+    ai: "AresBot"
+    valid_for: int = 8
+    health_bucket: float = 0.1
+    hits: int = 0
+    misses: int = 0
+    _results: dict[EngagementKey, tuple[EngagementResult, int]] = field(
+        default_factory=dict
+    )
+    _last_pruned: int = 0
+
+    def can_win_fight(
+        self, own_units: Units | list[Unit], enemy_units: Units | list[Unit]
+    ) -> EngagementResult:
+        game_loop: int = self.ai.state.game_loop
+        if game_loop - self._last_pruned >= self.valid_for:
+            self._prune(game_loop)
+
+        key: EngagementKey = (
+            frozenset(u.tag for u in own_units),
+            frozenset(u.tag for u in enemy_units),
+            self._health_bucket(own_units),
+            self._health_bucket(enemy_units),
+        )
+        cached: tuple[EngagementResult, int] | None = self._results.get(key)
+        if cached and game_loop - cached[1] < self.valid_for:
+            self.hits += 1
+            return cached[0]
+
+        self.misses += 1
+        result: EngagementResult = self.ai.mediator.can_win_fight(
+            own_units=own_units, enemy_units=enemy_units
+        )
+        self._results[key] = (result, game_loop)
+        return result
+
+    @property
+    def hit_rate(self) -> float:
+        total: int = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def _health_bucket(self, units: Units | list[Unit]) -> int:
+        health: float = 0.0
+        health_max: float = 0.0
+        for unit in units:
+            health += unit.health + unit.shield
+            health_max += unit.health_max + unit.shield_max
+        if health_max == 0.0:
+            return 0
+        return int(health / health_max / self.health_bucket)
+
+    def _prune(self, game_loop: int) -> None:
+        self._last_pruned = game_loop
+        self._results = {
+            key: cached
+            for key, cached in self._results.items()
+            if game_loop - cached[1] < self.valid_for
+        }
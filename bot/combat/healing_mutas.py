@@ -17,6 +17,7 @@ from sc2.unit import Unit
 from sc2.units import Units
 
 from bot.combat.base_combat import BaseCombat
+from bot.combat.squad_query_cache import SquadQueryCache
 
 if TYPE_CHECKING:
     from ares import AresBot
@@ -50,23 +51,34 @@ class HealingMutas(BaseCombat):
         target: Point2 = kwargs["target"]
         squad_position: Point2 = kwargs["squad_position"]
         retreat_pathing: DijkstraPathing = kwargs["retreat_pathing"]
+        squad_cache: SquadQueryCache = kwargs["squad_cache"]
+        squad_id: str = kwargs["squad_id"]
 
         avoid_grid: np.ndarray = self.mediator.get_air_avoidance_grid
+        easy_targets: Units = squad_cache.get(
+            squad_id,
+            "easy_targets",
+            lambda: self._vulnerable_ground_to_air_nearby(
+                close_enemies, further_enemies_near_squad
+            ),
+        )
+        retreat_to: Point2 | None = None
+        if not easy_targets:
+            # mutas are stacked, so one path from the squad covers all of them
+            retreat_to = Point2(
+                squad_cache.get_path(
+                    squad_id, "retreat_path", retreat_pathing, squad_position, 5
+                )[-1]
+            )
 
         for muta in units:
             muta_maneuver: CombatManeuver = CombatManeuver()
             muta_maneuver.add(KeepUnitSafe(muta, avoid_grid))
-            easy_targets = self._vulnerable_ground_to_air_nearby(
-                close_enemies, further_enemies_near_squad
-            )
             # something easy to attack nearby, then might as well
             if easy_targets:
                 muta_maneuver.add(
                     StutterUnitForward(muta, cy_closest_to(muta.position, easy_targets))
                 )
             else:
-                retreat_path = retreat_pathing.get_path(muta.position, 5)
-                muta_maneuver.add(
-                    UseAbility(AbilityId.MOVE_MOVE, muta, Point2(retreat_path[-1]))
-                )
+                muta_maneuver.add(UseAbility(AbilityId.MOVE_MOVE, muta, retreat_to))
             self.ai.register_behavior(muta_maneuver)
@@ -50,12 +50,12 @@ class HighGroundSpotters(BaseCombat):
             + self.mediator.get_own_structures_dict[UnitTypeId.SPINECRAWLERUPROOTED]
         )
 
-        for unit in units:
+        safe: np.ndarray = self.ai.position_safety.are_positions_safe(
+            grid, [unit.position for unit in units]
+        )
+        for i, unit in enumerate(units):
             unit_pos: Point2 = unit.position
-            if (
-                not self.mediator.is_position_safe(grid=grid, position=unit_pos)
-                or unit.health_percentage < 0.25
-            ):
+            if not safe[i] or unit.health_percentage < 0.25:
                 retreat_path: list[tuple] = retreat_pathing.get_path(unit_pos, 5)
                 if len(retreat_path) > 1:
                     unit.move(Point2(retreat_path[-1]))
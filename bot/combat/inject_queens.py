@@ -10,15 +10,20 @@ from ares.behaviors.combat.individual import (
     UseAbility,
 )
 from ares.managers.manager_mediator import ManagerMediator
+from cython_extensions import cy_distance_to_squared
 from sc2.ids.ability_id import AbilityId
 from sc2.unit import Unit
 from sc2.units import Units
 
 from bot.combat.base_combat import BaseCombat
+from bot.inject_scheduler import InjectScheduler
 
 if TYPE_CHECKING:
     from ares import AresBot
 
+# queens further than this from their hatchery are walked back
+OUT_OF_PLACE_DISTANCE_SQ: float = 36.0
+
 
 @dataclass
 class InjectQueens(BaseCombat):
@@ -41,18 +46,48 @@ class InjectQueens(BaseCombat):
     mediator: ManagerMediator
 
     def execute(self, units: Union[list[Unit], Units], **kwargs) -> None:
-        """Execute the behavior."""
-        inject_q_to_th_tags: dict[int, int] = kwargs.get("inject_q_to_th_tags", {})
+        """Execute the behavior.
+
+        Queens with enemies around get the full maneuver every step. The
+        rest only act when the scheduler says an inject is due, or every
+        so often to walk back to their hatchery.
+        """
+        if not units:
+            return
+
+        inject_scheduler: InjectScheduler = kwargs["inject_scheduler"]
         ground_grid: np.ndarray = self.mediator.get_ground_grid
         avoid_grid: np.ndarray = self.mediator.get_ground_avoidance_grid
-        for queen in units:
-            target_th_tag: int = inject_q_to_th_tags.get(queen.tag, None)
+        active: np.ndarray = self.ai.micro_lod.is_active(
+            [queen.position for queen in units]
+        )
+        for i, queen in enumerate(units):
+            target_th: Unit | None = inject_scheduler.townhall_for(queen)
+            if not active[i]:
+                if not target_th:
+                    continue
+                if (
+                    cy_distance_to_squared(queen.position, target_th.position)
+                    > OUT_OF_PLACE_DISTANCE_SQ
+                ):
+                    if inject_scheduler.path_due(queen):
+                        self.ai.register_behavior(
+                            PathUnitToTarget(
+                                queen,
+                                ground_grid,
+                                target_th.position,
+                                success_at_distance=4,
+                            )
+                        )
+                elif inject_scheduler.inject_due(queen, target_th):
+                    queen(AbilityId.EFFECT_INJECTLARVA, target_th)
+                continue
+
             maneuver: CombatManeuver = CombatManeuver()
             maneuver.add(KeepUnitSafe(queen, avoid_grid))
             maneuver.add(ShootTargetInRange(queen, self.ai.enemy_units))
 
-            if target_th_tag and target_th_tag in self.ai.unit_tag_dict:
-                target_th: Unit = self.ai.unit_tag_dict[target_th_tag]
+            if target_th:
                 maneuver.add(
                     UseAbility(
                         AbilityId.EFFECT_INJECTLARVA,
@@ -0,0 +1,135 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+from zlib import crc32
+
+import numpy as np
+from ares.behaviors.combat import CombatManeuver
+from ares.behaviors.combat.group import GroupUseAbility
+from sc2.ids.ability_id import AbilityId
+from sc2.position import Point2
+from sc2.unit import Unit
+from sc2.units import Units
+
+from bot.consts import COMMON_UNIT_IGNORE_TYPES
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+@dataclass
+class MicroLOD:
+    """Level of detail for micro, full micro is only needed near enemies.
+
+    Units or squads with no enemy inside `activation_radius` are in
+    transit. Enemy units ares remembers but we can't currently see count
+    as enemies. Combat classes skip their full maneuvers for these and run a
+    cheap path follow every `transit_cadence` game loops instead, staggered
+    by unit tag or squad id. As soon as an enemy comes into the activation
+    radius `is_active` is True again on that same frame.
+
+    Called from `bot/main.py`
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    activation_radius : float
+        Full micro switches on when an enemy is closer than this
+    transit_cadence : int
+        Game loops between path follow updates while in transit
+    """
+
+    ai: "AresBot"
+    activation_radius: float = 20.0
+    transit_cadence: int = 8
+    _game_loop: int = -1
+    _enemy_positions: np.ndarray = field(
+        default_factory=lambda: np.empty((0, 2), dtype=float)
+    )
+    _last_period: dict[int | str, int] = field(default_factory=dict)
+    _last_seen: dict[int | str, int] = field(default_factory=dict)
+    _next_prune: int = 0
+
+    def is_active(self, positions: np.ndarray | list[Point2]) -> np.ndarray:
+        """Check an (N, 2) array of positions for enemies in activation radius.
+
+        Returns
+        -------
+        np.ndarray :
+            Boolean vector, True where full micro should run.
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        enemy_positions: np.ndarray = self._get_enemy_positions()
+        if positions.shape[0] == 0 or enemy_positions.shape[0] == 0:
+            return np.zeros(positions.shape[0], dtype=bool)
+
+        diff: np.ndarray = positions[:, None, :] - enemy_positions[None, :, :]
+        distances_sq: np.ndarray = np.einsum("ijk,ijk->ij", diff, diff)
+        return distances_sq.min(axis=1) < self.activation_radius**2
+
+    def transit_due(self, key: int | str) -> bool:
+        """Check if the unit tag or squad id `key` should update its transit.
+
+        Each key gets its own offset so transit updates are spread across
+        frames instead of every unit updating on the same loop.
+        """
+        game_loop: int = self.ai.state.game_loop
+        self._last_seen[key] = game_loop
+        if game_loop >= self._next_prune:
+            self._prune(game_loop)
+
+        offset: int = key if isinstance(key, int) else crc32(key.encode())
+        period: int = (game_loop + offset) // self.transit_cadence
+        if self._last_period.get(key) == period:
+            return False
+
+        self._last_period[key] = period
+        return True
+
+    def follow_path(
+        self,
+        units: list[Unit] | Units,
+        start: Point2,
+        target: Point2,
+        grid: np.ndarray,
+    ) -> None:
+        """Move a group of units one path step from `start` towards `target`."""
+        if not units:
+            return
+        move_to: Point2 = self.ai.mediator.find_path_next_point(
+            start=start, target=target, grid=grid
+        )
+        maneuver: CombatManeuver = CombatManeuver()
+        maneuver.add(
+            GroupUseAbility(
+                AbilityId.MOVE_MOVE, list(units), {u.tag for u in units}, move_to
+            )
+        )
+        self.ai.register_behavior(maneuver)
+
+    def _prune(self, game_loop: int) -> None:
+        """Forget units and squads that haven't asked for a while."""
+        stale_before: int = game_loop - 2 * self.transit_cadence
+        for key in [k for k, seen in self._last_seen.items() if seen < stale_before]:
+            del self._last_seen[key]
+            self._last_period.pop(key, None)
+        self._next_prune = game_loop + self.transit_cadence
+
+    def _get_enemy_positions(self) -> np.ndarray:
+        game_loop: int = self.ai.state.game_loop
+        if game_loop != self._game_loop:
+            self._game_loop = game_loop
+            # ares' enemy army includes units we remember but can't see
+            self._enemy_positions = np.array(
+                [
+                    u.position
+                    for units in (
+                        self.ai.mediator.get_cached_enemy_army,
+                        self.ai.enemy_structures,
+                    )
+                    for u in units
+                    if u.type_id not in COMMON_UNIT_IGNORE_TYPES
+                ],
+                dtype=float,
+            ).reshape(-1, 2)
+        return self._enemy_positions
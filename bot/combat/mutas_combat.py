@@ -18,7 +18,6 @@ from cython_extensions import (
     cy_distance_to_squared,
     cy_in_attack_range,
     cy_pick_enemy_target,
-    cy_towards,
 )
 from cython_extensions.dijkstra import DijkstraPathing
 from sc2.ids.ability_id import AbilityId
@@ -28,12 +27,33 @@ from sc2.unit import Unit
 from sc2.units import Units
 
 from bot.combat.base_combat import BaseCombat
+from bot.combat.squad_query_cache import SquadQueryCache
+from bot.combat.threat_profiles import classify_air_threats
 
 if TYPE_CHECKING:
     from ares import AresBot
 
 ATTACK_PATH_LIMIT: int = 7
 
+# unit offsets sampled by `MutasCombat._get_stack_position`
+STACK_LINE_DISTANCES: np.ndarray = np.linspace(0.5, 2.0, 8)
+_STACK_RADII, _STACK_ANGLES = np.meshgrid(
+    np.linspace(1.0, 4.0, 4),
+    np.linspace(0, 2 * np.pi, 12, endpoint=False),
+    indexing="ij",
+)
+STACK_RING_OFFSETS: np.ndarray = np.column_stack(
+    (
+        (_STACK_RADII * np.cos(_STACK_ANGLES)).ravel(),
+        (_STACK_RADII * np.sin(_STACK_ANGLES)).ravel(),
+    )
+)
+
+
+def _distances_sq(points: np.ndarray, point: np.ndarray) -> np.ndarray:
+    diff: np.ndarray = points - point
+    return np.einsum("ij,ij->i", diff, diff)
+
 
 @dataclass
 class MutasCombat(BaseCombat):
@@ -67,15 +87,16 @@ class MutasCombat(BaseCombat):
         attack_pathing: DijkstraPathing = kwargs["attack_pathing"]
         retreat_pathing: DijkstraPathing = kwargs["retreat_pathing"]
         squad_tags: set[int] = kwargs["squad_tags"].copy()
+        squad_cache: SquadQueryCache = kwargs["squad_cache"]
+        squad_id: str = kwargs["squad_id"]
 
         close_enemy_combat_units: Units = close_enemies.filter(
             lambda u: (u.type_id not in ALL_STRUCTURES or u.can_attack_air)
             and not u.is_memory
             and (not u.is_cloaked or u.is_cloaked and u.is_revealed)
         )
-        close_dangers: Units = close_enemy_combat_units.filter(
-            lambda u: u.can_attack_air
-            or u.type_id in {UnitTypeId.SENTRY, UnitTypeId.VOIDRAY}
+        close_dangers: Units = Units(
+            classify_air_threats(close_enemy_combat_units).muta_dangers, self.ai
         )
 
         close_queens: Units = close_dangers.filter(
@@ -90,12 +111,16 @@ class MutasCombat(BaseCombat):
         ):
             fight_result: EngagementResult = EngagementResult.VICTORY_EMPHATIC
         else:
-            fight_result: EngagementResult = self.mediator.can_win_fight(
+            fight_result: EngagementResult = self.ai.engagement_cache.can_win_fight(
                 own_units=units, enemy_units=close_enemy_combat_units
             )
 
-        easy_targets: Units = self._vulnerable_ground_to_air_nearby(
-            close_enemies, further_enemies_near_squad
+        easy_targets: Units = squad_cache.get(
+            squad_id,
+            "easy_targets",
+            lambda: self._vulnerable_ground_to_air_nearby(
+                close_enemies, further_enemies_near_squad
+            ),
         )
         can_fight: bool = False
 
@@ -106,7 +131,7 @@ class MutasCombat(BaseCombat):
         if close_enemy_combat_units and fight_result in VICTORY_OVERWHELMING_OR_BETTER:
             # looks good, check a bit further now and see if the result still looks decent
             # this is to help prevent some hesitation
-            _fight_result: EngagementResult = self.mediator.can_win_fight(
+            _fight_result: EngagementResult = self.ai.engagement_cache.can_win_fight(
                 own_units=units, enemy_units=further_enemies_near_squad
             )
             if _fight_result not in LOSS_MARGINAL_OR_WORSE:
@@ -114,8 +139,12 @@ class MutasCombat(BaseCombat):
 
         attack_path: list[tuple[float, float]]
         retreat_path: list[tuple[float, float]]
-        attack_path = attack_pathing.get_path(squad_position, ATTACK_PATH_LIMIT)
-        retreat_path = retreat_pathing.get_path(squad_position, ATTACK_PATH_LIMIT)
+        attack_path = squad_cache.get_path(
+            squad_id, "attack_path", attack_pathing, squad_position, ATTACK_PATH_LIMIT
+        )
+        retreat_path = squad_cache.get_path(
+            squad_id, "retreat_path", retreat_pathing, squad_position, ATTACK_PATH_LIMIT
+        )
         move_to: Point2 = Point2(attack_path[-1])
         # short attack path prob means we are close to target, find safe spot
         if len(attack_path) < 7 and not self.mediator.is_position_safe(
@@ -303,66 +332,59 @@ class MutasCombat(BaseCombat):
         Find a gathering/stacking position for the group near the line between
         the group center and the desired move_to point, preferring safe tiles
         that are closest to move_to.
+
+        All candidates (base point, line samples and the radial ring) are
+        checked for safety in one query and scored together.
         """
         # calculate gathering point that minimizes total travel distance
-        positions = np.array([unit.position for unit in group])
-        optimal_pos = Point2(np.mean(positions, axis=0))
+        optimal_pos: np.ndarray = np.mean(
+            np.array([unit.position for unit in group], dtype=float), axis=0
+        )
+        move_to_arr: np.ndarray = np.array((move_to[0], move_to[1]), dtype=float)
+        direction: np.ndarray = move_to_arr - optimal_pos
+        length: float = float(np.hypot(direction[0], direction[1]))
+        if length > 0.0:
+            direction /= length
 
         # base point between optimal position and target
-        base_pos = Point2(cy_towards(optimal_pos, move_to, towards_target))
+        base_pos: np.ndarray = optimal_pos + direction * towards_target
+        if not safe_pos:
+            return Point2(base_pos)
+
+        line_candidates: np.ndarray = (
+            optimal_pos + STACK_LINE_DISTANCES[:, None] * direction
+        )
+        ring_candidates: np.ndarray = base_pos + STACK_RING_OFFSETS
+        safe: np.ndarray = self.ai.position_safety.are_positions_safe(
+            grid, np.vstack((base_pos, line_candidates, ring_candidates))
+        )
 
         # if the base position is already safe, keep it
-        if not safe_pos or self.mediator.is_position_safe(grid=grid, position=base_pos):
-            return base_pos
-
-        # First, try positions along the line from optimal_pos towards move_to
-        best_candidate: Point2 | None = None
-        best_score: float = float("inf")
-
-        # Sample positions along the line at different distances
-        line_samples = np.linspace(0.5, 2.0, 8)
-        for distance in line_samples:
-            line_candidate = Point2(cy_towards(optimal_pos, move_to, distance))
-            if self.mediator.is_position_safe(grid=grid, position=line_candidate):
-                # Score based on distance to move_to (closer is better)
-                score = cy_distance_to_squared(line_candidate, move_to)
-                if score < best_score:
-                    best_score = score
-                    best_candidate = line_candidate
-
-        # If we found a good candidate along the line, use it
-        if best_candidate is not None:
-            return best_candidate
-
-        # Otherwise, search in a radius around base_pos
-        max_radius: float = 4.0
-        radial_steps: int = 4
-        angle_steps: int = 12
-
-        radii = np.linspace(1.0, max_radius, radial_steps)
-        angles = np.linspace(0, 2 * np.pi, angle_steps, endpoint=False)
-
-        for r in radii:
-            for theta in angles:
-                cand_x = base_pos.x + r * np.cos(theta)
-                cand_y = base_pos.y + r * np.sin(theta)
-                candidate = Point2((cand_x, cand_y))
-
-                if not self.mediator.is_position_safe(grid=grid, position=candidate):
-                    continue
-
-                # Score combines distance to move_to (primary) and distance to group center (secondary)
-                move_to_dist = cy_distance_to_squared(candidate, move_to)
-                group_dist = cy_distance_to_squared(candidate, optimal_pos)
-                # Prioritize being closer to move_to, with group center as tiebreaker
-                score = move_to_dist + 0.1 * group_dist
-
-                if score < best_score:
-                    best_score = score
-                    best_candidate = candidate
+        if safe[0]:
+            return Point2(base_pos)
+
+        # then try positions along the line, closest to move_to wins
+        line_safe: np.ndarray = safe[1 : len(STACK_LINE_DISTANCES) + 1]
+        if line_safe.any():
+            scores: np.ndarray = np.where(
+                line_safe, _distances_sq(line_candidates, move_to_arr), np.inf
+            )
+            return Point2(line_candidates[np.argmin(scores)])
+
+        # otherwise search in a radius around base_pos, distance to move_to is
+        # the primary score with distance to group center as a tiebreaker
+        ring_safe: np.ndarray = safe[len(STACK_LINE_DISTANCES) + 1 :]
+        if ring_safe.any():
+            scores: np.ndarray = np.where(
+                ring_safe,
+                _distances_sq(ring_candidates, move_to_arr)
+                + 0.1 * _distances_sq(ring_candidates, optimal_pos),
+                np.inf,
+            )
+            return Point2(ring_candidates[np.argmin(scores)])
 
         # fall back to base_pos if we couldn't find anything safe nearby
-        return best_candidate if best_candidate is not None else base_pos
+        return Point2(base_pos)
 
     def _need_to_stack(
         self,
@@ -13,12 +13,7 @@ from ares.behaviors.combat.individual import (
     UseTransfuse,
 )
 from ares.managers.manager_mediator import ManagerMediator
-from cython_extensions import (
-    cy_closer_than,
-    cy_closest_to,
-    cy_distance_to_squared,
-    cy_has_creep,
-)
+from cython_extensions import cy_closer_than, cy_closest_to, cy_has_creep
 from sc2.ids.ability_id import AbilityId
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.position import Point2
@@ -32,6 +27,11 @@ from bot.consts import COMMON_UNIT_IGNORE_TYPES
 if TYPE_CHECKING:
     from ares import AresBot
 
+SPACING_TUMOR_TYPES: set[UnitTypeId] = {
+    UnitTypeId.CREEPTUMORQUEEN,
+    UnitTypeId.CREEPTUMORBURROWED,
+}
+
 
 @dataclass
 class QueenCombat(BaseCombat):
@@ -68,18 +68,29 @@ class QueenCombat(BaseCombat):
             self.ai.mediator.get_creep_coverage < 23.0 and not queens_can_fight
         )
 
+        # queens with nothing around only need an update every so often
+        active: np.ndarray = self.ai.micro_lod.is_active(
+            [queen.position for queen in units]
+        )
+        units = [
+            queen
+            for i, queen in enumerate(units)
+            if active[i] or self.ai.micro_lod.transit_due(queen.tag)
+        ]
+        if not units:
+            return
+
         everything_near_queens: dict[int, Units] = self.ai.mediator.get_units_in_range(
             start_points=units,
             distances=15.0,
             query_tree=UnitTreeQueryType.AllEnemy,
             return_as_dict=True,
         )
-        tumors: list[Unit] = (
-            self.mediator.get_own_structures_dict[UnitTypeId.CREEPTUMORQUEEN]
-            + self.mediator.get_own_structures_dict[UnitTypeId.CREEPTUMORBURROWED]
-        )
 
-        for queen in units:
+        safe: np.ndarray = self.ai.position_safety.are_positions_safe(
+            ground_grid, [queen.position for queen in units]
+        )
+        for i, queen in enumerate(units):
             close_enemy: Units = everything_near_queens[queen.tag].filter(
                 lambda u: not u.is_memory
                 and (u.type_id not in COMMON_UNIT_IGNORE_TYPES)
@@ -91,17 +102,10 @@ class QueenCombat(BaseCombat):
             if (
                 queens_can_fight
                 and not can_spread
-                and self.mediator.is_position_safe(grid=ground_grid, position=queen_pos)
+                and safe[i]
                 and cy_has_creep(self.ai.state.creep.data_numpy, queen_pos)
-                and (
-                    len(
-                        [
-                            t
-                            for t in tumors
-                            if cy_distance_to_squared(t.position, queen_pos) < 144.0
-                        ]
-                    )
-                    == 0
+                and not self.ai.tumor_index.any_within(
+                    queen_pos, 12.0, SPACING_TUMOR_TYPES
                 )
                 and not self.mediator.get_position_blocks_expansion(position=queen_pos)
                 and len(cy_closer_than(self.ai.townhalls, 6, queen_pos)) == 0
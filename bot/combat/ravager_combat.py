@@ -81,14 +81,16 @@ class RavagerCombat(BaseCombat):
         static_def: list[Unit] = [
             u for u in only_ground if u.type_id in GROUND_STATIC_DEFENCE_TYPES
         ]
-        for unit in units:
-            unit_pos: Point2 = unit.position
+        positions: list[Point2] = [unit.position for unit in units]
+        safe_from_avoid: np.ndarray = self.ai.position_safety.are_positions_safe(
+            avoid_grid, positions
+        )
+        safe: np.ndarray = self.ai.position_safety.are_positions_safe(grid, positions)
+        for i, unit in enumerate(units):
+            unit_pos: Point2 = positions[i]
             retreat_path: list[tuple] = retreat_pathing.get_path(unit_pos, 2)
             maneuver: CombatManeuver = CombatManeuver()
-            if (
-                not self.mediator.is_position_safe(grid=avoid_grid, position=unit_pos)
-                and len(retreat_path) > 1
-            ):
+            if not safe_from_avoid[i] and len(retreat_path) > 1:
                 maneuver.add(
                     UseAbility(AbilityId.MOVE_MOVE, unit, Point2(retreat_path[1]))
                 )
@@ -110,13 +112,7 @@ class RavagerCombat(BaseCombat):
                     maneuver.add(KeepUnitSafe(unit, grid))
                 else:
                     attack_ready: bool = cy_attack_ready(self.ai, unit, target_enemy)
-                    if (
-                        not attack_ready
-                        and len(retreat_path) > 1
-                        and not self.mediator.is_position_safe(
-                            grid=grid, position=unit_pos
-                        )
-                    ):
+                    if not attack_ready and len(retreat_path) > 1 and not safe[i]:
                         maneuver.add(
                             UseAbility(
                                 AbilityId.MOVE_MOVE, unit, Point2(retreat_path[-1])
@@ -0,0 +1,50 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+from cython_extensions.dijkstra import DijkstraPathing
+from sc2.position import Point2
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+T = TypeVar("T")
+
+
+@dataclass
+class SquadQueryCache:
+    """Memoise squad level queries for the current frame.
+
+    Combat classes that loop over the units of a squad can ask for
+    results keyed by squad id, so target analysis and path queries that
+    only depend on the squad are worked out once per squad per frame.
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    """
+
+    ai: "AresBot"
+    _game_loop: int = -1
+    _cache: dict[tuple[str, str], Any] = field(default_factory=dict)
+
+    def get(self, squad_id: str, key: str, compute: Callable[[], T]) -> T:
+        game_loop: int = self.ai.state.game_loop
+        if game_loop != self._game_loop:
+            self._game_loop = game_loop
+            self._cache.clear()
+
+        cache_key: tuple[str, str] = (squad_id, key)
+        if cache_key not in self._cache:
+            self._cache[cache_key] = compute()
+        return self._cache[cache_key]
+
+    def get_path(
+        self,
+        squad_id: str,
+        key: str,
+        pathing: DijkstraPathing,
+        position: Point2,
+        limit: int,
+    ) -> list[tuple[float, float]]:
+        return self.get(squad_id, key, lambda: pathing.get_path(position, limit))
@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from enum import IntFlag
+
+import numpy as np
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.unit import Unit
+from sc2.units import Units
+from src.ares.consts import ALL_STRUCTURES
+
+AIR_STATIC_DEFENCE_TYPES: set[UnitTypeId] = {
+    UnitTypeId.BUNKER,
+    UnitTypeId.SPORECRAWLER,
+    UnitTypeId.MISSILETURRET,
+    UnitTypeId.PHOTONCANNON,
+}
+
+IGNORE_ENEMY_TYPES: set[UnitTypeId] = {
+    UnitTypeId.ADEPTPHASESHIFT,
+    UnitTypeId.EGG,
+    UnitTypeId.LARVA,
+    UnitTypeId.OBSERVER,
+}
+
+
+class ThreatProfile(IntFlag):
+    """What a unit type means to our air units, one bit per trait."""
+
+    NONE = 0
+    # has a weapon that can hit air
+    ANTI_AIR = 1
+    # dangerous to flyers even if the weapon data says otherwise
+    FLYER_DANGER = 2
+    # dangerous enough that mutas shouldn't fight into it
+    MUTA_DANGER = 4
+    # anti air structure, only a danger once ready
+    STATIC_DEFENCE = 8
+    # harmless to us but not worth chasing (oracles, sentries, observers)
+    HARMLESS_DETECTOR = 16
+    # never a target
+    IGNORE = 32
+    STRUCTURE = 64
+
+
+FLYER_DANGER_TYPES: set[UnitTypeId] = {UnitTypeId.AUTOTURRET, UnitTypeId.VOIDRAY}
+MUTA_DANGER_TYPES: set[UnitTypeId] = {UnitTypeId.SENTRY, UnitTypeId.VOIDRAY}
+HARMLESS_DETECTOR_TYPES: set[UnitTypeId] = {
+    UnitTypeId.OBSERVER,
+    UnitTypeId.ORACLE,
+    UnitTypeId.SENTRY,
+}
+IGNORE_TYPES: set[UnitTypeId] = IGNORE_ENEMY_TYPES | {UnitTypeId.DARKTEMPLAR}
+
+_PROFILES: dict[UnitTypeId, int] = dict()
+
+
+def _build_profile(unit: Unit) -> int:
+    type_id: UnitTypeId = unit.type_id
+    profile: ThreatProfile = ThreatProfile.NONE
+    # weapons come from the unit type data, so this is the same for every
+    # unit of a type
+    if unit.can_attack_air:
+        profile |= ThreatProfile.ANTI_AIR
+    if type_id in FLYER_DANGER_TYPES:
+        profile |= ThreatProfile.FLYER_DANGER
+    if type_id in MUTA_DANGER_TYPES:
+        profile |= ThreatProfile.MUTA_DANGER
+    if type_id in AIR_STATIC_DEFENCE_TYPES:
+        profile |= ThreatProfile.STATIC_DEFENCE
+    if type_id in HARMLESS_DETECTOR_TYPES:
+        profile |= ThreatProfile.HARMLESS_DETECTOR
+    if type_id in IGNORE_TYPES:
+        profile |= ThreatProfile.IGNORE
+    if type_id in ALL_STRUCTURES:
+        profile |= ThreatProfile.STRUCTURE
+    return int(profile)
+
+
+def threat_profile(unit: Unit) -> int:
+    """Look up the profile of `unit`, building it the first time we see the type."""
+    if (profile := _PROFILES.get(unit.type_id)) is None:
+        profile = _PROFILES[unit.type_id] = _build_profile(unit)
+    return profile
+
+
+@dataclass
+class AirThreats:
+    """Partitions of a set of enemy units as seen by our air units.
+
+    Parameters
+    ----------
+    dangers : list[Unit]
+        Anything that can shoot flyers, static defence only once ready.
+    muta_dangers : list[Unit]
+        Units mutas should be wary of engaging.
+    easy_targets : list[Unit]
+        Attackable units that can't shoot back and are worth chasing.
+    """
+
+    dangers: list[Unit]
+    muta_dangers: list[Unit]
+    easy_targets: list[Unit]
+
+
+def classify_air_threats(units: Units | list[Unit]) -> AirThreats:
+    """Split `units` into danger and easy target partitions in one pass."""
+    if not units:
+        return AirThreats([], [], [])
+
+    _units: list[Unit] = list(units)
+    profiles: np.ndarray = np.fromiter(
+        (threat_profile(u) for u in _units), dtype=np.int64, count=len(_units)
+    )
+    anti_air: np.ndarray = (profiles & ThreatProfile.ANTI_AIR) != 0
+    static: np.ndarray = (profiles & ThreatProfile.STATIC_DEFENCE) != 0
+
+    dangers: np.ndarray = anti_air | ((profiles & ThreatProfile.FLYER_DANGER) != 0)
+    for i in np.flatnonzero(static & ~dangers):
+        dangers[i] = _units[i].is_ready
+
+    muta_dangers: np.ndarray = anti_air | ((profiles & ThreatProfile.MUTA_DANGER) != 0)
+
+    not_easy: int = (
+        ThreatProfile.ANTI_AIR | ThreatProfile.HARMLESS_DETECTOR | ThreatProfile.IGNORE
+    )
+    easy_candidates: np.ndarray = np.flatnonzero((profiles & not_easy) == 0)
+
+    return AirThreats(
+        dangers=[_units[i] for i in np.flatnonzero(dangers)],
+        muta_dangers=[_units[i] for i in np.flatnonzero(muta_dangers)],
+        easy_targets=[_units[i] for i in easy_candidates if _units[i].can_be_attacked],
+    )
+
+
+def only_non_structures(units: list[Unit]) -> list[Unit]:
+    return [u for u in units if not threat_profile(u) & ThreatProfile.STRUCTURE]
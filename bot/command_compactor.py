@@ -0,0 +1,137 @@
+from collections import Counter
+from dataclasses import dataclass
+from itertools import groupby
+from typing import TYPE_CHECKING
+
+from ares.consts import DEBUG
+from loguru import logger
+from sc2.ids.ability_id import AbilityId
+from sc2.position import Point2
+from sc2.unit import Unit
+from sc2.unit_command import UnitCommand
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+# moving a unit a fraction of a tile doesn't change what it does, but a
+# building, creep tumor or bile landing somewhere else does
+SNAP_ABILITIES: set[AbilityId] = {
+    AbilityId.ATTACK,
+    AbilityId.ATTACK_ATTACK,
+    AbilityId.MOVE,
+    AbilityId.MOVE_MOVE,
+    AbilityId.PATROL,
+    AbilityId.PATROL_PATROL,
+    AbilityId.SCAN_MOVE,
+    AbilityId.SMART,
+}
+
+
+@dataclass
+class CommandCompactor:
+    """Arrange this step's commands so they go out as few raw actions as possible.
+
+    python-sc2 already merges commands into one raw action with many unit
+    tags, but only when they are next to each other in `self.actions` and
+    share exactly the same ability, target and queue flag. Here move and
+    attack style point targets (see `SNAP_ABILITIES`) within
+    `snap_distance` of each other are snapped to the same point, then
+    commands are ordered so identical ones sit together. Other abilities
+    are only merged when their targets match exactly.
+
+    Units given more than one command this step keep their commands in
+    the original order, so queued commands still follow the order they
+    were issued in.
+
+    Called from `bot/main.py`
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    snap_distance : float
+        Point targets of the same ability closer than this are merged
+    """
+
+    ai: "AresBot"
+    snap_distance: float = 0.5
+    num_commands: int = 0
+    num_raw_actions: int = 0
+    num_frames: int = 0
+    last_ratio: float = 1.0
+    best_ratio: float = 1.0
+
+    def compact(self, actions: list[UnitCommand]) -> list[UnitCommand]:
+        if not actions:
+            return actions
+
+        commands_per_unit: Counter = Counter(a.unit.tag for a in actions)
+        groups: dict[tuple, list[UnitCommand]] = dict()
+        in_order: list[UnitCommand] = []
+        snap_points: dict[tuple[AbilityId, bool], list[Point2]] = dict()
+        for action in actions:
+            if commands_per_unit[action.unit.tag] > 1:
+                in_order.append(action)
+                continue
+            action = self._snap(action, snap_points)
+            groups.setdefault(self._combining_key(action), []).append(action)
+
+        compacted: list[UnitCommand] = [
+            action for group in groups.values() for action in group
+        ] + in_order
+
+        num_raw: int = sum(
+            1 for _ in groupby(compacted, key=lambda a: self._combining_key(a))
+        )
+        self.num_commands += len(actions)
+        self.num_raw_actions += num_raw
+        self.num_frames += 1
+        self.last_ratio = len(actions) / num_raw
+        self.best_ratio = max(self.best_ratio, self.last_ratio)
+        if self.ai.config[DEBUG]:
+            logger.debug(
+                f"{self.ai.time_formatted} - {len(actions)} commands "
+                f"in {num_raw} actions ({self.last_ratio:.2f}x)"
+            )
+        return compacted
+
+    @property
+    def ratio(self) -> float:
+        """Commands per raw action over the whole game."""
+        if self.num_raw_actions == 0:
+            return 1.0
+        return self.num_commands / self.num_raw_actions
+
+    def _snap(
+        self,
+        action: UnitCommand,
+        snap_points: dict[tuple[AbilityId, bool], list[Point2]],
+    ) -> UnitCommand:
+        if (
+            action.ability not in SNAP_ABILITIES
+            or action.target is None
+            or isinstance(action.target, Unit)
+        ):
+            return action
+
+        target: Point2 = action.target.to2
+        points: list[Point2] = snap_points.setdefault(
+            (action.ability, action.queue), []
+        )
+        for point in points:
+            if target.distance_to_point2(point) < self.snap_distance:
+                if point == action.target:
+                    return action
+                return UnitCommand(action.ability, action.unit, point, action.queue)
+
+        points.append(target)
+        if target != action.target:
+            return UnitCommand(action.ability, action.unit, target, action.queue)
+        return action
+
+    @staticmethod
+    def _combining_key(action: UnitCommand) -> tuple:
+        target = action.target
+        if isinstance(target, Unit):
+            target = target.tag
+        return action.ability, target, action.queue
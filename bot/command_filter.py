@@ -0,0 +1,78 @@
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from sc2.position import Point2
+from sc2.unit import Unit, UnitOrder
+from sc2.unit_command import UnitCommand
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+@dataclass
+class CommandFilter:
+    """Drop commands that would give a unit the order it already has.
+
+    Runs on `self.actions` at the end of `on_step`. A command is dropped
+    when it is the only command the unit got this step, it isn't queued,
+    has a target, and the unit's single current order has the same ability
+    and the same target. A unit given several commands in one step
+    (retreat then attack, stutter step...) keeps all of them, since
+    dropping one would let an earlier command override it. Commands
+    without a target (train, research, burrow...) are always sent, since
+    repeating those isn't a no-op.
+
+    This overlaps with python-sc2's `prevent_double_actions`, which
+    already drops a command repeating the current order with the same
+    target unit or exactly the same point. What this adds is that point
+    targets within `point_tolerance` count as the same, so units chasing
+    a point that drifts a little each step (a stack position, a retreat
+    spot) aren't given the same move again.
+
+    Called from `bot/main.py`
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    point_tolerance : float
+        Point targets closer than this to the current order's target are
+        considered unchanged
+    """
+
+    ai: "AresBot"
+    point_tolerance: float = 0.5
+    num_sent: int = 0
+    num_dropped: int = 0
+
+    def filter(self, actions: list[UnitCommand]) -> list[UnitCommand]:
+        num_commands: Counter[int] = Counter(a.unit.tag for a in actions)
+        to_send: list[UnitCommand] = [
+            a for a in actions if num_commands[a.unit.tag] > 1 or not self._is_no_op(a)
+        ]
+        self.num_sent += len(to_send)
+        self.num_dropped += len(actions) - len(to_send)
+        return to_send
+
+    def _is_no_op(self, action: UnitCommand) -> bool:
+        if action.queue or action.target is None:
+            return False
+        unit: Unit = action.unit
+        if len(unit.orders) != 1:
+            return False
+
+        order: UnitOrder = unit.orders[0]
+        # orders report the generic ability, eg. ATTACK rather than ATTACK_ATTACK
+        if not (ability_data := self.ai.game_data.abilities.get(action.ability.value)):
+            return False
+        if order.ability.id != ability_data.id:
+            return False
+
+        if isinstance(action.target, Unit):
+            return order.target == action.target.tag
+        if not isinstance(order.target, Point2):
+            return False
+        dx: float = order.target.x - action.target.x
+        dy: float = order.target.y - action.target.y
+        return dx * dx + dy * dy <= self.point_tolerance**2
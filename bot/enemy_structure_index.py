@@ -0,0 +1,150 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+from sc2.unit import Unit
+from sc2.units import Units
+
+from bot.consts import TOWNHALL_TYPES
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+LIFTABLE_TYPES: set[UnitTypeId] = {
+    UnitTypeId.BARRACKS,
+    UnitTypeId.BARRACKSFLYING,
+    UnitTypeId.COMMANDCENTER,
+    UnitTypeId.COMMANDCENTERFLYING,
+    UnitTypeId.FACTORY,
+    UnitTypeId.FACTORYFLYING,
+    UnitTypeId.ORBITALCOMMAND,
+    UnitTypeId.ORBITALCOMMANDFLYING,
+    UnitTypeId.STARPORT,
+    UnitTypeId.STARPORTFLYING,
+}
+# structures that change type in place, no event fires when an enemy's does
+TYPE_CHANGING_TYPES: set[UnitTypeId] = LIFTABLE_TYPES | {
+    UnitTypeId.SUPPLYDEPOT,
+    UnitTypeId.SUPPLYDEPOTLOWERED,
+}
+
+
+@dataclass
+class EnemyStructureIndex:
+    """Enemy structures we know about, kept up to date from unit events.
+
+    Structures are added when they enter vision and removed when they are
+    destroyed. Terran structures that can lift off or be lowered are the
+    only ones that change type or move, so they are the only ones
+    refreshed every step. A depot being lowered or raised changes the
+    ramp wall.
+    If the number of structures disagrees with `ai.enemy_structures` the
+    index is rebuilt.
+
+    Anything derived from the whole set (the position array used for
+    `closest_to`, the enemy ramp wall check) is only worked out again
+    after the set has changed.
+
+    Called from `bot/main.py`
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    """
+
+    ai: "AresBot"
+    _structures: dict[int, tuple[Point2, UnitTypeId]] = field(default_factory=dict)
+    _townhalls: set[int] = field(default_factory=set)
+    _flying: set[int] = field(default_factory=set)
+    _type_changing: set[int] = field(default_factory=set)
+    _positions: np.ndarray | None = None
+    _ramp_walled_off: bool | None = None
+
+    def update(self) -> None:
+        """Refresh structures that can change type, resync if we drifted.
+
+        Called every step from `bot/main.py`
+        """
+        enemy_structures: Units = self.ai.enemy_structures
+        if len(enemy_structures) != len(self._structures):
+            self._rebuild(enemy_structures)
+        elif self._type_changing:
+            for structure in enemy_structures(TYPE_CHANGING_TYPES):
+                if structure.tag not in self._structures:
+                    self._rebuild(enemy_structures)
+                    return
+                position, type_id = self._structures[structure.tag]
+                if type_id != structure.type_id:
+                    self.add(structure)
+                # flying around doesn't change the ramp
+                elif structure.is_flying and position != structure.position:
+                    self._structures[structure.tag] = (structure.position, type_id)
+                    self._positions = None
+
+    def add(self, unit: Unit) -> None:
+        if not unit.is_structure:
+            return
+        self._structures[unit.tag] = (unit.position, unit.type_id)
+        if unit.type_id in TOWNHALL_TYPES:
+            self._townhalls.add(unit.tag)
+        else:
+            self._townhalls.discard(unit.tag)
+        if unit.type_id in TYPE_CHANGING_TYPES:
+            self._type_changing.add(unit.tag)
+        if unit.is_flying:
+            self._flying.add(unit.tag)
+        else:
+            self._flying.discard(unit.tag)
+        self._set_dirty()
+
+    def remove(self, tag: int) -> None:
+        if self._structures.pop(tag, None) is None:
+            return
+        self._townhalls.discard(tag)
+        self._flying.discard(tag)
+        self._type_changing.discard(tag)
+        self._set_dirty()
+
+    @property
+    def any_flying(self) -> bool:
+        return len(self._flying) > 0
+
+    @property
+    def townhall_positions(self) -> list[Point2]:
+        return [self._structures[tag][0] for tag in self._townhalls]
+
+    def closest_to(self, position: Point2) -> Point2 | None:
+        if not self._structures:
+            return None
+        if self._positions is None:
+            self._positions = np.array(
+                [pos for pos, _ in self._structures.values()], dtype=float
+            )
+        diff: np.ndarray = self._positions - np.array(
+            (position[0], position[1]), dtype=float
+        )
+        return Point2(self._positions[np.argmin(np.einsum("ij,ij->i", diff, diff))])
+
+    def enemy_ramp_walled_off(self) -> bool:
+        """Only asks ares again after an enemy structure changed."""
+        if self._ramp_walled_off is None:
+            self._ramp_walled_off = self.ai.main_ramp_walled_off(
+                self.ai.mediator.get_enemy_ramp
+            )
+        return self._ramp_walled_off
+
+    def _set_dirty(self) -> None:
+        self._positions = None
+        self._ramp_walled_off = None
+
+    def _rebuild(self, enemy_structures: Units) -> None:
+        self._structures.clear()
+        self._townhalls.clear()
+        self._flying.clear()
+        self._type_changing.clear()
+        for structure in enemy_structures:
+            self.add(structure)
+        self._set_dirty()
@@ -0,0 +1,107 @@
+from dataclasses import dataclass, field
+from math import ceil
+from typing import TYPE_CHECKING
+
+from cython_extensions import cy_closest_to
+from sc2.unit import Unit
+from sc2.units import Units
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+INJECT_ENERGY: float = 25.0
+# 0.7875 energy per game second, 22.4 game loops per second
+ENERGY_PER_LOOP: float = 0.7875 / 22.4
+
+
+@dataclass
+class InjectScheduler:
+    """Work out when each inject queen next has something to do.
+
+    A queen can inject once she has 25 energy and her hatchery's larva
+    inject timer has run out, both of which can be forecast. Until then
+    she is left alone. Queens away from their hatchery are pathed back
+    at most every `path_every` game loops.
+
+    Also owns the queen to townhall pairing used by `QueenRoleController`,
+    dropping pairs when either side dies and pairing unpaired inject
+    queens with the closest townhall that doesn't have a queen.
+
+    Created in `QueenManager`
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    pairs : dict[int, int]
+        Inject queen tag to townhall tag, shared with `QueenRoleController`
+    path_every : int
+        Game loops between path updates for a queen away from her hatchery
+    retry_after : int
+        Game loops to wait after an inject before checking the queen again
+    """
+
+    ai: "AresBot"
+    pairs: dict[int, int]
+    path_every: int = 22
+    retry_after: int = 8
+    _wake_at: dict[int, int] = field(default_factory=dict)
+    _next_path: dict[int, int] = field(default_factory=dict)
+
+    def townhall_for(self, queen: Unit) -> Unit | None:
+        """The townhall `queen` injects, pairing her with one if needed."""
+        if (th_tag := self.pairs.get(queen.tag)) and (
+            th := self.ai.unit_tag_dict.get(th_tag)
+        ):
+            return th
+
+        paired: set[int] = set(self.pairs.values())
+        free: list[Unit] = [
+            th
+            for th in self.ai.townhalls
+            if th.build_progress > 0.95 and th.tag not in paired
+        ]
+        if not free:
+            return None
+        th: Unit = cy_closest_to(queen.position, free)
+        self.pairs[queen.tag] = th.tag
+        return th
+
+    def inject_due(self, queen: Unit, townhall: Unit) -> bool:
+        """Check if `queen` should inject now, otherwise forecast when."""
+        game_loop: int = self.ai.state.game_loop
+        if game_loop < self._wake_at.get(queen.tag, 0):
+            return False
+
+        loops_to_energy: int = ceil(
+            max(0.0, INJECT_ENERGY - queen.energy) / ENERGY_PER_LOOP
+        )
+        loops_to_wake: int = max(loops_to_energy, townhall.buff_duration_remain)
+        if loops_to_wake > 0:
+            self._wake_at[queen.tag] = game_loop + loops_to_wake
+            return False
+
+        self._wake_at[queen.tag] = game_loop + self.retry_after
+        return True
+
+    def path_due(self, queen: Unit) -> bool:
+        game_loop: int = self.ai.state.game_loop
+        if game_loop < self._next_path.get(queen.tag, 0):
+            return False
+        self._next_path[queen.tag] = game_loop + self.path_every
+        return True
+
+    def remove(self, tag: int) -> None:
+        """Forget a dead queen or townhall."""
+        self.pairs.pop(tag, None)
+        self._wake_at.pop(tag, None)
+        self._next_path.pop(tag, None)
+        for queen_tag in [q for q, th in self.pairs.items() if th == tag]:
+            del self.pairs[queen_tag]
+
+    def sync(self, inject_queens: Units) -> None:
+        """Drop pairs for queens that no longer inject."""
+        tags: set[int] = inject_queens.tags
+        for queen_tag in [q for q in self.pairs if q not in tags]:
+            del self.pairs[queen_tag]
+            self._wake_at.pop(queen_tag, None)
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from sc2.position import Point2
+from sc2.unit import Unit
+
+from bot.openings.opening_base import OpeningBase
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+@dataclass
+class LazyOpening:
+    """An opening we may transition into, built only once it's needed.
+
+    The opening class is looked up by name in `ai.opening_registry`. It is
+    constructed and started the first time it is stepped, or `start` is
+    awaited. `warm` can be called ahead of a likely transition to
+    construct it early, `on_start` still waits for the transition since
+    it assigns unit roles.
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    opening_name : str
+        Class name of the opening in `bot/openings`
+    """
+
+    ai: "AresBot"
+    opening_name: str
+    _opening: OpeningBase | None = None
+    _started: bool = False
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    def warm(self) -> None:
+        if self._opening is None:
+            self._opening = self.ai.opening_registry.create(self.opening_name)
+
+    async def start(self) -> OpeningBase:
+        self.warm()
+        if not self._started:
+            self._started = True
+            await self._opening.on_start(self.ai)
+        return self._opening
+
+    async def on_step(self, target: Point2 | None = None) -> None:
+        opening: OpeningBase = await self.start()
+        await opening.on_step(target)
+
+    def on_unit_created(self, unit: Unit) -> None:
+        if self._started:
+            self._opening.on_unit_created(unit)
@@ -0,0 +1,32 @@
+from dataclasses import dataclass
+from typing import Callable, Hashable
+
+from ares.behaviors.macro import MacroPlan
+
+
+@dataclass
+class MacroPlanCache:
+    """Reuse an opening's `MacroPlan` while its inputs stay the same.
+
+    Openings work out the handful of values their plan depends on
+    (townhall count, thresholds crossed, army composition...) and pass
+    them in as a fingerprint. The plan is only rebuilt when the
+    fingerprint changes, otherwise last step's plan is registered again.
+
+    Created in `OpeningBase.on_start`
+    """
+
+    hits: int = 0
+    misses: int = 0
+    _fingerprint: Hashable | None = None
+    _plan: MacroPlan | None = None
+
+    def get(self, fingerprint: Hashable, build: Callable[[], MacroPlan]) -> MacroPlan:
+        if self._plan is not None and fingerprint == self._fingerprint:
+            self.hits += 1
+            return self._plan
+
+        self.misses += 1
+        self._fingerprint = fingerprint
+        self._plan = build()
+        return self._plan
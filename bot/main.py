@@ -1,4 +1,5 @@
-import importlib
+from collections import Counter
+from time import perf_counter
 from typing import Any, Optional
 
 from loguru import logger
@@ -7,31 +8,40 @@ from ares import AresBot
 from ares.behaviors.combat.individual import TumorSpreadCreep
 from ares.behaviors.macro.mining import Mining
 from ares.consts import UnitRole
-from sc2.data import Race
+from sc2.data import Race, Result
 from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
 from sc2.unit import Unit
 
+from bot.combat.engagement_cache import EngagementCache
+from bot.combat.micro_lod import MicroLOD
+from bot.command_compactor import CommandCompactor
+from bot.command_filter import CommandFilter
+from bot.enemy_structure_index import EnemyStructureIndex
+from bot.macro_plan_cache import MacroPlanCache
+from bot.mineral_patch_index import MineralPatchIndex
+from bot.opening_registry import OpeningRegistry
+from bot.position_safety import PositionSafety
 from bot.queen_manager import QueenManager
-
-
-def _to_snake(name: str) -> str:
-    # Convert e.g. "OneBaseTempest" -> "one_base_tempest"
-    out = []
-    for i, c in enumerate(name):
-        if i > 0:
-            prev = name[i - 1]
-            nxt = name[i + 1] if i + 1 < len(name) else ""
-            if c.isupper() and (
-                (not prev.isupper())  # lower->Upper
-                or (prev.isupper() and nxt and not nxt.isupper())  # UPPER->UpperLower
-            ):
-                out.append("_")
-        out.append(c.lower())
-    return "".join(out)
+from bot.role_assigner import RoleAssigner
+from bot.supply_tracker import SupplyTracker
+from bot.tumor_index import TUMOR_TYPES, TumorIndex
+from bot.warm_up import warm_up_hot_paths
 
 
 class MyBot(AresBot):
+    command_compactor: CommandCompactor
+    command_filter: CommandFilter
+    enemy_structure_index: EnemyStructureIndex
+    engagement_cache: EngagementCache
+    micro_lod: MicroLOD
+    mineral_patch_index: MineralPatchIndex
+    opening_registry: OpeningRegistry
+    position_safety: PositionSafety
     queen_manager: QueenManager
+    role_assigner: RoleAssigner
+    supply_tracker: SupplyTracker
+    tumor_index: TumorIndex
 
     def __init__(self, game_step_override: Optional[int] = None):
         """Initiate custom bot
@@ -49,21 +59,34 @@ class MyBot(AresBot):
         self._switched_to_prevent_tie: bool = False
         self._on_gas: bool = True
         self._switched_due_to_worker_rush: bool = False
+        self.macro_plan_caches: list[MacroPlanCache] = []
+        self.role_transitions: Counter = Counter()
 
     def load_opening(self, opening_name: str) -> None:
-        """Load opening from bot.openings.<snake_case> with class <PascalCase>"""
-        module_path = f"bot.openings.{_to_snake(opening_name)}"
-        module = importlib.import_module(module_path)
-        opening_cls = getattr(module, opening_name, None)
-        if opening_cls is None:
-            raise ImportError(
-                f"Opening class '{opening_name}' not found in '{module_path}'"
-            )
-        self.opening_handler = opening_cls()
+        """Swap in opening class `opening_name` from the opening registry"""
+        start: float = perf_counter()
+        self.opening_handler = self.opening_registry.create(opening_name)
+        logger.info(
+            f"{self.time_formatted} - Loaded {opening_name} in "
+            f"{(perf_counter() - start) * 1e6:.0f}us"
+        )
 
     async def on_start(self) -> None:
         await super(MyBot, self).on_start()
         self.queen_manager = QueenManager(self)
+        self.role_assigner = RoleAssigner(self)
+        self.role_assigner.subscribe(self._on_role_changed)
+        self.supply_tracker = SupplyTracker(self)
+        self.enemy_structure_index = EnemyStructureIndex(self)
+        self.tumor_index = TumorIndex(self)
+        self.mineral_patch_index = MineralPatchIndex(self)
+        self.position_safety = PositionSafety(self)
+        self.micro_lod = MicroLOD(self)
+        self.engagement_cache = EngagementCache(self)
+        self.command_filter = CommandFilter(self)
+        self.command_compactor = CommandCompactor(self)
+        self.opening_registry = OpeningRegistry()
+        self.opening_registry.discover()
         # Ares has initialized BuildOrderRunner at this point
         try:
             self.load_opening(self.build_order_runner.chosen_opening)
@@ -72,10 +95,24 @@ class MyBot(AresBot):
         except Exception as exc:
             print(f"Failed to load opening: {exc}")
 
+        # openings we may switch to mid game, see `on_step`
+        self.opening_registry.prepare("DroneRushVariation")
+        if self.enemy_race in {Race.Terran, Race.Random}:
+            self.opening_registry.prepare("OneBaseMuta")
+
+        try:
+            warm_up_time: float = warm_up_hot_paths(self)
+            logger.info(f"Warm up took {warm_up_time * 1e3:.1f}ms")
+        except Exception as exc:
+            logger.warning(f"Warm up failed: {exc}")
+
     async def on_step(self, iteration: int) -> None:
         await super(MyBot, self).on_step(iteration)
         if self.supply_used < 1:
             await self.client.leave()
+        self.tumor_index.update()
+        self.supply_tracker.update()
+        self.enemy_structure_index.update()
         self.queen_manager.update()
 
         self._on_gas_toggle()
@@ -110,10 +147,13 @@ class MyBot(AresBot):
             self._switched_due_to_worker_rush = True
             logger.info(f"{self.time_formatted} - Switched to DroneRushVariation")
 
-        for tumor in self.structures(UnitTypeId.CREEPTUMORBURROWED):
-            self.register_behavior(
-                TumorSpreadCreep(tumor, self.enemy_start_locations[0])
-            )
+        # only tumors that haven't spread yet can do anything, the target is
+        # shared and each `TumorSpreadCreep` picks its own spot towards it
+        spread_target: Point2 = self.enemy_start_locations[0]
+        await self.tumor_index.confirm_spent()
+        for tumor in self.tumor_index.active_tumors():
+            self.register_behavior(TumorSpreadCreep(tumor, spread_target))
+        self.tumor_index.set_spreading(self.actions)
 
         if not self._switched_to_prevent_tie and self.floating_enemy:
             self._switched_to_prevent_tie = True
@@ -127,6 +167,12 @@ class MyBot(AresBot):
 
             await self.chat_send(f"Tag: {self.time_formatted}_switched_to_prevent_tie")
 
+        # behaviors execute when registered, so every command for this step
+        # is in `self.actions` by now
+        self.actions = self.command_compactor.compact(
+            self.command_filter.filter(self.actions)
+        )
+
     async def on_unit_created(self, unit: Unit) -> None:
         await super(MyBot, self).on_unit_created(unit)
 
@@ -136,6 +182,28 @@ class MyBot(AresBot):
         if unit.type_id == UnitTypeId.QUEEN:
             self.queen_manager.assign_new_queen(unit)
 
+    async def on_building_construction_started(self, unit: Unit) -> None:
+        await super(MyBot, self).on_building_construction_started(unit)
+        self.tumor_index.add(unit)
+
+    async def on_unit_type_changed(self, unit: Unit, previous_type: UnitTypeId) -> None:
+        await super(MyBot, self).on_unit_type_changed(unit, previous_type)
+        if unit.type_id in TUMOR_TYPES:
+            self.tumor_index.update_type(unit)
+
+    async def on_unit_destroyed(self, unit_tag: int) -> None:
+        await super(MyBot, self).on_unit_destroyed(unit_tag)
+        self.tumor_index.remove(unit_tag)
+        self.queen_manager.on_unit_destroyed(unit_tag)
+        self.role_assigner.remove(unit_tag)
+        self.supply_tracker.remove(unit_tag)
+        self.enemy_structure_index.remove(unit_tag)
+
+    async def on_enemy_unit_entered_vision(self, unit: Unit) -> None:
+        await super(MyBot, self).on_enemy_unit_entered_vision(unit)
+        self.supply_tracker.add(unit)
+        self.enemy_structure_index.add(unit)
+
     async def on_unit_took_damage(self, unit: Unit, amount_damage_taken: float) -> None:
         await super(MyBot, self).on_unit_took_damage(unit, amount_damage_taken)
 
@@ -149,7 +217,7 @@ class MyBot(AresBot):
             return False
 
         if (
-            len([s for s in self.enemy_structures if s.is_flying]) > 0
+            self.enemy_structure_index.any_flying
             and self.state.visibility[self.enemy_start_locations[0].rounded] != 0
             and len(self.enemy_units) < 4
         ):
@@ -162,12 +230,34 @@ class MyBot(AresBot):
     Examples:
     """
 
-    #
-    # async def on_end(self, game_result: Result) -> None:
-    #     await super(MyBot, self).on_end(game_result)
-    #
-    #     # custom on_end logic here ...
-    #
+    async def on_end(self, game_result: Result) -> None:
+        await super(MyBot, self).on_end(game_result)
+
+        logger.info(
+            f"Dropped {self.command_filter.num_dropped} repeated commands, "
+            f"sent {self.command_filter.num_sent}"
+        )
+        logger.info(
+            f"Sent {self.command_compactor.num_commands} commands in "
+            f"{self.command_compactor.num_raw_actions} actions "
+            f"({self.command_compactor.ratio:.2f}x), best frame "
+            f"{self.command_compactor.best_ratio:.2f}x over "
+            f"{self.command_compactor.num_frames} frames with commands"
+        )
+        logger.info(
+            f"Engagement cache: {self.engagement_cache.hits} hits, "
+            f"{self.engagement_cache.misses} misses "
+            f"({self.engagement_cache.hit_rate:.0%})"
+        )
+        logger.info(
+            f"Macro plan cache: "
+            f"{sum(c.hits for c in self.macro_plan_caches)} hits, "
+            f"{sum(c.misses for c in self.macro_plan_caches)} misses"
+        )
+        for (previous_role, role), count in self.role_transitions.most_common(5):
+            previous_name: str = previous_role.name if previous_role else "None"
+            logger.info(f"Role change {previous_name} -> {role.name}: {count}")
+
     async def on_building_construction_complete(self, unit: Unit) -> None:
         await super(MyBot, self).on_building_construction_complete(unit)
 
@@ -184,11 +274,6 @@ class MyBot(AresBot):
     #
     #     # custom on_unit_created logic here ...
     #
-    # async def on_unit_destroyed(self, unit_tag: int) -> None:
-    #     await super(MyBot, self).on_unit_destroyed(unit_tag)
-    #
-    #     # custom on_unit_destroyed logic here ...
-    #
     # async def on_unit_took_damage(self, unit: Unit, amount_damage_taken: float) -> None:
     #     await super(MyBot, self).on_unit_took_damage(unit, amount_damage_taken)
     #
@@ -205,3 +290,8 @@ class MyBot(AresBot):
             self._on_gas = False
         if not self._on_gas and self.vespene < 100 and self.supply_workers >= 12:
             self._on_gas = True
+
+    def _on_role_changed(
+        self, tag: int, previous_role: Optional[UnitRole], role: UnitRole
+    ) -> None:
+        self.role_transitions[(previous_role, role)] += 1
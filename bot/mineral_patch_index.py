@@ -0,0 +1,108 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+from cython_extensions import cy_towards
+from sc2.position import Point2
+from sc2.unit import Unit
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+@dataclass
+class MineralPatchIndex:
+    """Mineral patch positions as numpy arrays, grouped by base.
+
+    Patches only disappear when they mine out, so the arrays are rebuilt
+    when the number of mineral fields changes rather than every step.
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    """
+
+    ai: "AresBot"
+    _num_fields: int = -1
+    _patches: list[Unit] = field(default_factory=list)
+    _positions: np.ndarray = field(default_factory=lambda: np.empty((0, 2)))
+    _base_of_patch: np.ndarray = field(
+        default_factory=lambda: np.empty(0, dtype=np.intp)
+    )
+    _main_patch: Unit | None = None
+
+    @property
+    def main_patch(self) -> Unit | None:
+        """Patch closest to our start location."""
+        self._refresh()
+        return self._main_patch
+
+    def patches_at_base(self, base_location: Point2) -> list[Unit]:
+        self._refresh()
+        if not self._patches:
+            return []
+        base_idx: int = self._closest_base_index(base_location)
+        return [
+            self._patches[i] for i in np.flatnonzero(self._base_of_patch == base_idx)
+        ]
+
+    def closest_to(self, position: Point2) -> Unit | None:
+        self._refresh()
+        if not self._patches:
+            return None
+        return self._patches[int(np.argmin(self._distances_sq(position)))]
+
+    def patch_behind(self, unit_pos: Point2, enemy_pos: Point2) -> Unit | None:
+        """Patch behind `unit_pos`, away from `enemy_pos`, to mineral walk to.
+
+        Draws a point 6 behind the worker and keeps patches closer to that
+        point than to the enemy and further than 4 from the worker. Returns
+        the one closest to the worker, or `None` if nothing qualifies.
+        """
+        self._refresh()
+        if not self._patches:
+            return None
+        position: Point2 = cy_towards(enemy_pos, unit_pos, 6.0)
+        to_unit: np.ndarray = self._distances_sq(unit_pos)
+        valid: np.ndarray = (
+            self._distances_sq(position) < self._distances_sq(enemy_pos)
+        ) & (to_unit > 16.0)
+        if not valid.any():
+            return None
+        candidates: np.ndarray = np.flatnonzero(valid)
+        return self._patches[int(candidates[np.argmin(to_unit[candidates])])]
+
+    def _distances_sq(self, position: Point2) -> np.ndarray:
+        diff: np.ndarray = self._positions - np.array(
+            (position[0], position[1]), dtype=float
+        )
+        return np.einsum("ij,ij->i", diff, diff)
+
+    def _closest_base_index(self, position: Point2) -> int:
+        bases: np.ndarray = np.array(self.ai.expansion_locations_list, dtype=float)
+        diff: np.ndarray = bases - np.array((position[0], position[1]), dtype=float)
+        return int(np.argmin(np.einsum("ij,ij->i", diff, diff)))
+
+    def _refresh(self) -> None:
+        mineral_field = self.ai.mineral_field
+        if len(mineral_field) == self._num_fields:
+            return
+
+        self._num_fields = len(mineral_field)
+        self._patches = list(mineral_field)
+        if not self._patches:
+            self._positions = np.empty((0, 2))
+            self._base_of_patch = np.empty(0, dtype=np.intp)
+            self._main_patch = None
+            return
+
+        self._positions = np.array([mf.position for mf in self._patches], dtype=float)
+        bases: np.ndarray = np.array(self.ai.expansion_locations_list, dtype=float)
+        base_diff: np.ndarray = self._positions[:, None, :] - bases[None, :, :]
+        self._base_of_patch = np.argmin(
+            np.einsum("ijk,ijk->ij", base_diff, base_diff), axis=1
+        )
+        self._main_patch = self._patches[
+            int(np.argmin(self._distances_sq(self.ai.start_location)))
+        ]
@@ -0,0 +1,62 @@
+import importlib
+import pkgutil
+from dataclasses import dataclass, field
+from types import ModuleType
+
+from bot import openings
+from bot.openings.opening_base import OpeningBase
+
+
+@dataclass
+class OpeningRegistry:
+    """Every opening class in `bot/openings`, imported ahead of time.
+
+    `discover` imports each module in the package once at startup and
+    records the `OpeningBase` subclasses defined in it by class name.
+    Openings we might switch to mid game can be constructed early with
+    `prepare`, so a switch only has to hand over an existing object.
+
+    Only the import and the constructor are moved ahead of time. Opening
+    constructors are cheap, the setup that matters (combat classes, task
+    scheduler, role assignments) happens in `on_start`, which needs the
+    game state at the time of the switch and still runs then.
+
+    Called from `bot/main.py`
+    """
+
+    _classes: dict[str, type[OpeningBase]] = field(default_factory=dict)
+    _prepared: dict[str, OpeningBase] = field(default_factory=dict)
+
+    def discover(self) -> None:
+        for module_info in pkgutil.iter_modules(openings.__path__):
+            module: ModuleType = importlib.import_module(
+                f"{openings.__name__}.{module_info.name}"
+            )
+            for name, obj in vars(module).items():
+                if (
+                    isinstance(obj, type)
+                    and issubclass(obj, OpeningBase)
+                    and obj is not OpeningBase
+                    and obj.__module__ == module.__name__
+                ):
+                    self._classes[name] = obj
+
+    def get_class(self, opening_name: str) -> type[OpeningBase]:
+        if opening_name not in self._classes:
+            raise ImportError(
+                f"Opening class '{opening_name}' not found in '{openings.__name__}'"
+            )
+        return self._classes[opening_name]
+
+    def prepare(self, opening_name: str) -> None:
+        """Construct `opening_name` now so `create` doesn't have to later.
+
+        This doesn't run `on_start`, see the class docstring.
+        """
+        if opening_name not in self._prepared:
+            self._prepared[opening_name] = self.get_class(opening_name)()
+
+    def create(self, opening_name: str) -> OpeningBase:
+        if (opening := self._prepared.pop(opening_name, None)) is not None:
+            return opening
+        return self.get_class(opening_name)()
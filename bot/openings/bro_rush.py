@@ -24,18 +24,18 @@ from sc2.ids.upgrade_id import UpgradeId
 from sc2.position import Point2
 from sc2.unit import Unit
 from sc2.units import Units
-from src.ares.consts import ALL_STRUCTURES, UnitRole, UnitTreeQueryType
+from src.ares.consts import ALL_STRUCTURES, UnitTreeQueryType
 
 from bot.consts import COMMON_UNIT_IGNORE_TYPES
-from bot.openings.opening_base import OpeningBase
-from bot.openings.ultras import Ultras
+from bot.lazy_opening import LazyOpening
+from bot.openings.opening_base import MACRO_CADENCE, OpeningBase
 
 
 class BroRush(OpeningBase):
     BURROW_AT_HEALTH_PERC: float = 0.3
     UNBURROW_AT_HEALTH_PERC: float = 0.9
 
-    _ultras: OpeningBase
+    _ultras: LazyOpening
 
     def __init__(self):
         super().__init__()
@@ -52,8 +52,8 @@ class BroRush(OpeningBase):
     async def on_start(self, ai: AresBot) -> None:
         await super().on_start(ai)
 
-        self._ultras = Ultras()
-        await self._ultras.on_start(ai)
+        self._ultras = LazyOpening(ai, "Ultras")
+        self.scheduler.add("macro", MACRO_CADENCE, urgent=True)
 
     async def on_step(self, target: Point2 | None = None) -> None:
         self._micro(
@@ -62,28 +62,47 @@ class BroRush(OpeningBase):
         )
 
         if not self._transitioned and self.ai.build_order_runner.build_completed:
+            if self.ai.supply_army >= 14:
+                self._ultras.warm()
             if self.ai.supply_army >= 20:
                 logger.info(f"{self.ai.time_formatted} - Transitioning to ultras")
                 self._transitioned = True
-            macro_plan: MacroPlan = MacroPlan()
-            macro_plan.add(
-                UpgradeController([UpgradeId.BURROW], self.ai.start_location)
-            )
-            macro_plan.add(AutoSupply(base_location=self.ai.start_location))
-            macro_plan.add(SpawnController(self.army_comp))
-            macro_plan.add(ExpansionController(to_count=16))
-            macro_plan.add(BuildWorkers(to_count=22))
-            self.ai.register_behavior(macro_plan)
+            if self.scheduler.due("macro"):
+                self._macro()
         elif self._transitioned:
             await self._ultras.on_step(target)
 
-        for queen in self.ai.mediator.get_units_from_role(role=UnitRole.QUEEN_INJECT):
-            if queen.energy >= 25 and self.ai.townhalls:
-                queen(AbilityId.EFFECT_INJECTLARVA, self.ai.townhalls[0])
+    def _macro(self) -> None:
+        self.ai.register_behavior(self.macro_plan_cache.get((), self._build_macro_plan))
+
+    def _build_macro_plan(self) -> MacroPlan:
+        # nothing here depends on game state, so this is only built once
+        macro_plan: MacroPlan = MacroPlan()
+        macro_plan.add(UpgradeController([UpgradeId.BURROW], self.ai.start_location))
+        macro_plan.add(AutoSupply(base_location=self.ai.start_location))
+        macro_plan.add(SpawnController(self.army_comp))
+        macro_plan.add(ExpansionController(to_count=16))
+        macro_plan.add(BuildWorkers(to_count=22))
+        return macro_plan
 
     def _micro(self, forces: Units) -> None:
+        if not forces:
+            return
+
+        active: np.ndarray = self.ai.micro_lod.is_active(
+            [unit.position for unit in forces]
+        )
+        # roaches in transit only need an update every so often
+        to_micro: list[Unit] = [
+            unit
+            for i, unit in enumerate(forces)
+            if active[i] or self.ai.micro_lod.transit_due(unit.tag)
+        ]
+        if not to_micro:
+            return
+
         near_enemy: dict[int, Units] = self.ai.mediator.get_units_in_range(
-            start_points=forces,
+            start_points=to_micro,
             distances=15,
             query_tree=UnitTreeQueryType.EnemyGround,
             return_as_dict=True,
@@ -93,7 +112,7 @@ class BroRush(OpeningBase):
 
         target: Point2 = self.attack_target
 
-        for unit in forces:
+        for unit in to_micro:
             attacking_maneuver: CombatManeuver = CombatManeuver()
 
             # we already calculated close enemies, use unit tag to retrieve them
@@ -2,12 +2,7 @@ import numpy as np
 from ares import AresBot
 from ares.behaviors.macro import BuildWorkers, AutoSupply
 from ares.consts import UnitRole
-from cython_extensions import (
-    cy_closer_than,
-    cy_closest_to,
-    cy_distance_to_squared,
-    cy_unit_pending,
-)
+from cython_extensions import cy_distance_to_squared, cy_unit_pending
 from sc2.ids.unit_typeid import UnitTypeId
 from sc2.position import Point2
 from sc2.unit import Unit
@@ -16,14 +11,13 @@ from sc2.units import Units
 from bot.combat.base_combat import BaseCombat
 from bot.combat.drone_combat import DroneCombat
 from bot.combat.high_ground_spotters import HighGroundSpotters
-from bot.openings.opening_base import OpeningBase
-from bot.openings.ravager_rush import RavagerRush
+from bot.lazy_opening import LazyOpening
+from bot.openings.opening_base import MACRO_CADENCE, OpeningBase
 
 
 class DroneRush(OpeningBase):
     _drone_combat: BaseCombat
     _high_ground_spotters: HighGroundSpotters
-    _ravager_rush: OpeningBase
 
     def __init__(self):
         super().__init__()
@@ -35,14 +29,15 @@ class DroneRush(OpeningBase):
         self._time_started_attack: float = 0.0
         self._reached_location: bool = False
         self._enemy_walled_off: bool = False
+        self._ravager_rush: LazyOpening | None = None
 
     async def on_start(self, ai: AresBot) -> None:
         await super().on_start(ai)
         self._drone_combat = DroneCombat(ai, ai.config, ai.mediator)
+        self.scheduler.add("macro", MACRO_CADENCE, urgent=True)
 
         if self.ai.build_order_runner.chosen_opening == "DroneRush":
-            self._ravager_rush = RavagerRush()
-            await self._ravager_rush.on_start(self.ai)
+            self._ravager_rush = LazyOpening(ai, "RavagerRush")
         elif self.ai.build_order_runner.chosen_opening == "LingDroneRush":
             self._min_drone_health = 0.0
             self._num_gatherers_to_leave = 0
@@ -59,19 +54,20 @@ class DroneRush(OpeningBase):
     async def on_step(self, target: Point2 | None = None) -> None:
         self._manage_worker_rush()
 
-        if not self._enemy_walled_off and self.ai.state.game_loop % 20 == 0:
-            self._enemy_walled_off = self.ai.main_ramp_walled_off(
-                self.ai.mediator.get_enemy_ramp
+        if not self._enemy_walled_off:
+            self._enemy_walled_off = (
+                self.ai.enemy_structure_index.enemy_ramp_walled_off()
             )
             if self._enemy_walled_off:
                 await self.ai.chat_send(f"Tag: {self.ai.time_formatted}: WallOff")
 
-        if self._attack_started and hasattr(self, "_ravager_rush"):
+        if self._attack_started and self._ravager_rush is not None:
             await self._ravager_rush.on_step(target)
         elif (
             self._attack_started
             and self.ai.build_order_runner.build_completed
             and self.ai.build_order_runner.chosen_opening != "LingDroneRush"
+            and self.scheduler.due("macro")
         ):
             self.ai.register_behavior(BuildWorkers(200))
             self.ai.register_behavior(AutoSupply(self.ai.start_location))
@@ -79,7 +75,7 @@ class DroneRush(OpeningBase):
     def on_unit_created(self, unit: Unit) -> None:
         if self.ai.time < 50.0 and unit.type_id == UnitTypeId.DRONE:
             self.ai.mediator.assign_role(tag=unit.tag, role=UnitRole.CONTROL_GROUP_FIVE)
-        if hasattr(self, "_ravager_rush"):
+        if self._ravager_rush is not None:
             self._ravager_rush.on_unit_created(unit)
 
     def _manage_worker_rush(self):
@@ -117,7 +113,7 @@ class DroneRush(OpeningBase):
             )
             if self.ai.time < self._time_started_attack + self._stack_for:
                 mfs: Units = Units(
-                    cy_closer_than(self.ai.mineral_field, 14.0, self.ai.start_location),
+                    self.ai.mineral_patch_index.patches_at_base(self.ai.start_location),
                     self.ai,
                 )
                 mf: Unit = mfs.furthest_to(self.ai.start_location)
@@ -128,7 +124,7 @@ class DroneRush(OpeningBase):
 
             elif not self._reached_location:
                 enemy_nat: Point2 = self.ai.mediator.get_enemy_nat
-                mf: Unit = cy_closest_to(enemy_nat, self.ai.mineral_field)
+                mf: Unit = self.ai.mineral_patch_index.closest_to(enemy_nat)
                 for unit in drones:
                     unit.return_resource() if unit.is_carrying_resource else unit.gather(
                         mf
@@ -5,7 +5,7 @@ from sc2.position import Point2
 from sc2.unit import Unit
 
 from bot.openings.drone_rush import DroneRush
-from bot.openings.opening_base import OpeningBase
+from bot.openings.opening_base import MACRO_CADENCE, OpeningBase
 
 
 class LingDroneRush(OpeningBase):
@@ -27,6 +27,7 @@ class LingDroneRush(OpeningBase):
 
         self._drone_rush = DroneRush()
         await self._drone_rush.on_start(self.ai)
+        self.scheduler.add("macro", MACRO_CADENCE, urgent=True)
 
     async def on_step(self, target: Point2 | None = None) -> None:
         await self._drone_rush.on_step(target)
@@ -34,7 +35,7 @@ class LingDroneRush(OpeningBase):
         for ling in self.ai.mediator.get_own_army_dict[UnitTypeId.ZERGLING]:
             ling.attack(attack_target)
 
-        if self.ai.build_order_runner.build_completed:
+        if self.ai.build_order_runner.build_completed and self.scheduler.due("macro"):
             macro_plan: MacroPlan = MacroPlan()
 
             if self.ai.supply_used > 19 or self.ai.supply_left <= 0:
@@ -29,9 +29,10 @@ from sc2.units import Units
 from bot.combat.base_combat import BaseCombat
 from bot.combat.healing_mutas import HealingMutas
 from bot.combat.mutas_combat import MutasCombat
+from bot.combat.squad_query_cache import SquadQueryCache
 from bot.consts import COMMON_UNIT_IGNORE_TYPES
-from bot.openings.opening_base import OpeningBase
-from bot.openings.ultras import Ultras
+from bot.lazy_opening import LazyOpening
+from bot.openings.opening_base import MACRO_CADENCE, OpeningBase
 
 STATIC_DEFENCE: set[UnitTypeId] = {
     UnitTypeId.BUNKER,
@@ -49,7 +50,8 @@ class OneBaseMuta(OpeningBase):
 
     _mutas_combat: BaseCombat
     _healing_mutas: BaseCombat
-    _ultras: OpeningBase
+    _squad_cache: SquadQueryCache
+    _ultras: LazyOpening
 
     def __init__(self):
         super().__init__()
@@ -73,21 +75,25 @@ class OneBaseMuta(OpeningBase):
         await super().on_start(ai)
         self._mutas_combat = MutasCombat(ai, ai.config, ai.mediator)
         self._healing_mutas = HealingMutas(ai, ai.config, ai.mediator)
-
-        self._ultras = Ultras()
-        await self._ultras.on_start(ai)
+        self._squad_cache = SquadQueryCache(ai)
+        self.scheduler.add("macro", MACRO_CADENCE, urgent=True)
+        self.scheduler.add("overlords", 8)
+        self._ultras = LazyOpening(ai, "Ultras")
 
     async def on_step(self, target: Point2 | None = None) -> None:
         self._micro(target)
         if not self._transitioned and self.ai.build_order_runner.build_completed:
+            if self.ai.supply_army >= 36:
+                self._ultras.warm()
             if self.ai.supply_army >= 46:
                 logger.info(f"{self.ai.time_formatted} - Transitioning to ultras")
                 self._transitioned = True
-            self._macro()
+            if self.scheduler.due("macro"):
+                self._macro()
         elif self._transitioned:
             await self._ultras.on_step(target)
 
-        if self.ai.state.game_loop % 8 == 0:
+        if self.scheduler.due("overlords"):
             spawn: Point2 = self.ai.start_location
             for ol in self.ai.mediator.get_own_army_dict[UnitTypeId.OVERLORD]:
                 if cy_distance_to_squared(ol.position, spawn) > 25.0:
@@ -113,52 +119,72 @@ class OneBaseMuta(OpeningBase):
         num_gatherers: int = len(
             self.ai.mediator.get_units_from_role(role=UnitRole.GATHERING)
         )
-        macro_plan: MacroPlan = MacroPlan()
-
         skip_supply: bool = num_gatherers < 6 and self.ai.supply_left > 0
-        if not skip_supply:
-            macro_plan.add(AutoSupply(self.ai.start_location))
-        if self.ai.townhalls(UnitTypeId.LAIR):
-            macro_plan.add(
-                SpawnController(
-                    army_composition_dict=self.army_comp, freeflow_mode=True
-                )
-            )
+        has_lair: bool = bool(self.ai.townhalls(UnitTypeId.LAIR))
+        # army comp changes once we have a queen
+        has_queen: bool = len(self.ai.mediator.get_own_army_dict[UnitTypeId.QUEEN]) > 0
+        tech_to_lair: bool = self.ai.minerals >= 150
+        worker_target: int = (
+            16 + num_non_gatherers
+            if len(self.ai.townhalls) < 2
+            else min(80, len(self.ai.townhalls) * 22)
+        )
+        expand: bool = self.ai.supply_army >= 10 and self.ai.minerals >= 250
+        take_gas: bool = num_gatherers > 11 and bool(
+            self.ai.structures(UnitTypeId.SPAWNINGPOOL)
+        )
 
-        if self.ai.minerals >= 150:
+        def _build() -> MacroPlan:
+            macro_plan: MacroPlan = MacroPlan()
+            if not skip_supply:
+                macro_plan.add(AutoSupply(self.ai.start_location))
+            if has_lair:
+                macro_plan.add(
+                    SpawnController(
+                        army_composition_dict=self.army_comp, freeflow_mode=True
+                    )
+                )
+            if tech_to_lair:
+                macro_plan.add(
+                    TechUp(
+                        desired_tech=UnitTypeId.LAIR,
+                        base_location=self.ai.start_location,
+                    )
+                )
             macro_plan.add(
                 TechUp(
-                    desired_tech=UnitTypeId.LAIR,
+                    desired_tech=UnitTypeId.SPIRE,
                     base_location=self.ai.start_location,
                 )
             )
-        macro_plan.add(
-            TechUp(
-                desired_tech=UnitTypeId.SPIRE,
-                base_location=self.ai.start_location,
-            )
-        )
-        macro_plan.add(
-            BuildWorkers(
-                to_count=16 + num_non_gatherers
-                if len(self.ai.townhalls) < 2
-                else min(80, len(self.ai.townhalls) * 22)
+            macro_plan.add(BuildWorkers(to_count=worker_target))
+            if expand:
+                macro_plan.add(ExpansionController(to_count=16))
+            if take_gas:
+                macro_plan.add(GasBuildingController(to_count=32))
+            return macro_plan
+
+        self.ai.register_behavior(
+            self.macro_plan_cache.get(
+                (
+                    skip_supply,
+                    has_lair,
+                    has_queen,
+                    tech_to_lair,
+                    worker_target,
+                    expand,
+                    take_gas,
+                ),
+                _build,
             )
         )
-        if self.ai.supply_army >= 10 and self.ai.minerals >= 250:
-            macro_plan.add(ExpansionController(to_count=16))
-        if num_gatherers > 11 and self.ai.structures(UnitTypeId.SPAWNINGPOOL):
-            macro_plan.add(GasBuildingController(to_count=32))
-        self.ai.register_behavior(macro_plan)
 
     def _micro(self, attack_target: Point2 = None) -> None:
         for muta in self.ai.mediator.get_own_army_dict[UnitTypeId.MUTALISK]:
             if muta.health_percentage < self.MUTA_MIN_HEALTH_PERC:
-                self.ai.mediator.assign_role(tag=muta.tag, role=UnitRole.HEALING)
+                self.ai.role_assigner.assign(muta.tag, UnitRole.HEALING)
             else:
-                self.ai.mediator.assign_role(
-                    tag=muta.tag, role=UnitRole.HARASSING_MUTAS
-                )
+                self.ai.role_assigner.assign(muta.tag, UnitRole.HARASSING_MUTAS)
 
         muta_target: Point2
         if ground_enemy := self.ai.mediator.get_main_ground_threats_near_townhall:
@@ -257,4 +283,6 @@ class OneBaseMuta(OpeningBase):
                 retreat_pathing=retreat_pathing,
                 pos_of_main_squad=pos_of_main_squad,
                 squad_tags=squad.tags,
+                squad_id=squad.squad_id,
+                squad_cache=self._squad_cache,
             )
@@ -15,12 +15,20 @@ from s2clientprotocol.raw_pb2 import Unit
 from sc2.position import Point2
 from sc2.units import Units
 
-from bot.consts import ATTACK_TARGET_IGNORE, TOWNHALL_TYPES, UNITS_TO_IGNORE
+from bot.consts import ATTACK_TARGET_IGNORE, UNITS_TO_IGNORE
+from bot.macro_plan_cache import MacroPlanCache
+from bot.task_scheduler import TaskScheduler
+
+# game loops between runs of recurring opening tasks
+MACRO_CADENCE: int = 4
+UPGRADE_CADENCE: int = 16
 
 
 class OpeningBase(metaclass=ABCMeta):
     ai: AresBot
     height_grid: np.ndarray
+    macro_plan_cache: MacroPlanCache
+    scheduler: TaskScheduler
 
     def __init__(self):
         super().__init__()
@@ -32,6 +40,10 @@ class OpeningBase(metaclass=ABCMeta):
         self.ai = ai
         self.current_base_target = ai.enemy_start_locations[0]
         self.height_grid = self.ai.game_info.terrain_height.data_numpy.T
+        self.scheduler = TaskScheduler(ai, is_urgent=lambda: self.macro_is_urgent)
+        self.macro_plan_cache = MacroPlanCache()
+        # every opening's cache is reported in `MyBot.on_end`
+        ai.macro_plan_caches.append(self.macro_plan_cache)
 
     @abstractmethod
     async def on_step(self, target: Point2 | None = None) -> None:
@@ -41,8 +53,15 @@ class OpeningBase(metaclass=ABCMeta):
         pass
 
     @property_cache_once_per_frame
+    def macro_is_urgent(self) -> bool:
+        """Worker rushed or supply blocked, macro shouldn't wait for its turn."""
+        return self.ai.mediator.get_enemy_worker_rushed or (
+            self.ai.supply_left <= 0 and self.ai.supply_cap < 200
+        )
+
+    @property
     def supply_enemy(self) -> float:
-        return self.ai.get_total_supply(self.ai.mediator.get_cached_enemy_army)
+        return self.ai.supply_tracker.enemy_supply
 
     @property_cache_once_per_frame
     def air_retreat_pathing(self) -> DijkstraPathing:
@@ -110,11 +129,13 @@ class OpeningBase(metaclass=ABCMeta):
         center_mass: Point2 = self.ai.start_location
         if enemy_units:
             center_mass, num_units = cy_find_units_center_mass(enemy_units, 12.5)
-        enemy_structures: Units = self.ai.enemy_structures
+        closest_structure: Point2 | None = self.ai.enemy_structure_index.closest_to(
+            self.ai.start_location
+        )
         if num_units > 5:
             return Point2(center_mass)
-        elif enemy_structures and self.ai.time > 120.0:
-            return enemy_structures.closest_to(self.ai.start_location).position
+        elif closest_structure and self.ai.time > 120.0:
+            return closest_structure
         elif (
             self.ai.time < 150.0
             or self.ai.state.visibility[self.ai.enemy_start_locations[0].rounded] == 0
@@ -142,7 +163,7 @@ class OpeningBase(metaclass=ABCMeta):
         # attempt to find harass target where the enemy are not
         harass_target: Point2 = self.ai.enemy_start_locations[0]
         enemy_units: Units = self.ai.enemy_units(UNITS_TO_IGNORE)
-        enemy_bases: Units = self.ai.enemy_structures(TOWNHALL_TYPES)
+        enemy_bases: list[Point2] = self.ai.enemy_structure_index.townhall_positions
 
         if enemy_units and enemy_bases:
             center_mass: Point2 = Point2(
@@ -151,10 +172,10 @@ class OpeningBase(metaclass=ABCMeta):
             # choose harass target furthest from enemy mass
             max_dist: float = 0
             for base in enemy_bases:
-                dist: float = cy_distance_to_squared(center_mass, base.position)
+                dist: float = cy_distance_to_squared(center_mass, base)
                 if dist > max_dist:
                     max_dist = dist
-                    harass_target = base.position
+                    harass_target = base
             # also check enemy spawn, we might not have scouted there yet
             dist: float = cy_distance_to_squared(
                 center_mass, self.ai.enemy_start_locations[0]
@@ -172,10 +193,10 @@ class OpeningBase(metaclass=ABCMeta):
         )
         if len(proxy_workers) > max_proxy_workers:
             for worker in proxy_workers:
-                self.ai.mediator.assign_role(tag=worker.tag, role=UnitRole.GATHERING)
+                self.ai.role_assigner.assign(worker.tag, UnitRole.GATHERING)
 
         if len(proxy_workers) < max_proxy_workers:
             if worker := self.ai.mediator.select_worker(target_position=proxy_location):
-                self.ai.mediator.assign_role(tag=worker.tag, role=UnitRole.PROXY_WORKER)
+                self.ai.role_assigner.assign(worker.tag, UnitRole.PROXY_WORKER)
 
         return proxy_workers
@@ -30,7 +30,7 @@ from src.ares.consts import WORKER_TYPES
 from bot.combat.base_combat import BaseCombat
 from bot.combat.queen_combat import QueenCombat
 from bot.consts import COMMON_UNIT_IGNORE_TYPES
-from bot.openings.opening_base import OpeningBase
+from bot.openings.opening_base import MACRO_CADENCE, OpeningBase
 from bot.openings.ravager_rush import RavagerRush
 
 STATIC_DEFENCE: set[UnitTypeId] = {
@@ -80,12 +80,17 @@ class ProxyHatch(OpeningBase):
         self._proxy_hatch_location = self._calculate_proxy_hatch_location()
         self._ravager_rush = RavagerRush()
         await self._ravager_rush.on_start(self.ai)
+        self.scheduler.add("macro", MACRO_CADENCE, urgent=True)
 
     async def on_step(self, target: Point2 | None = None) -> None:
         if self.ai.time > self._send_drone_at:
             await self._manage_proxy()
 
-        if self.ai.build_order_runner.build_completed and self._proxy_hatch_started:
+        if (
+            self.ai.build_order_runner.build_completed
+            and self._proxy_hatch_started
+            and self.scheduler.due("macro")
+        ):
             self._macro()
 
         await self._ravager_rush.on_step(target)
@@ -98,52 +103,71 @@ class ProxyHatch(OpeningBase):
         self._ravager_rush.on_unit_created(unit)
 
     def _macro(self) -> None:
-        macro_plan: MacroPlan = MacroPlan()
-        macro_plan.add(
-            SpawnController(
-                army_composition_dict=self.army_comp,
-                spawn_target=self._proxy_hatch_location,
-                freeflow_mode=True,
-            )
-        )
-        if self.ai.time > 120.0 or self.ai.supply_used >= 19:
-            macro_plan.add(AutoSupply(self.ai.start_location))
-        if self.ai.minerals >= 150:
-            macro_plan.add(
-                TechUp(
-                    desired_tech=UnitTypeId.SPAWNINGPOOL,
-                    base_location=self.ai.start_location,
-                )
-            )
-        if len(self.ai.gas_buildings) > 1 and self.ai.minerals >= 100:
-            macro_plan.add(
-                TechUp(
-                    desired_tech=UnitTypeId.ROACHWARREN,
-                    base_location=self.ai.start_location,
-                )
-            )
-
-        if (
+        # army comp depends on the spines and our gas
+        has_gas: bool = self.ai.vespene > 100
+        auto_supply: bool = self.ai.time > 120.0 or self.ai.supply_used >= 19
+        tech_pool: bool = self.ai.minerals >= 150
+        tech_warren: bool = len(self.ai.gas_buildings) > 1 and self.ai.minerals >= 100
+        need_queens: bool = (
             len(self.ai.mediator.get_own_army_dict[UnitTypeId.QUEEN])
             + cy_unit_pending(self.ai, UnitTypeId.QUEEN)
             < 6
-        ):
+        )
+        spines_completed: bool = self._proxy_spines_completed
+
+        def _build() -> MacroPlan:
+            macro_plan: MacroPlan = MacroPlan()
             macro_plan.add(
                 SpawnController(
-                    army_composition_dict={
-                        UnitTypeId.QUEEN: {"proportion": 1.0, "priority": 0}
-                    },
+                    army_composition_dict=self.army_comp,
                     spawn_target=self._proxy_hatch_location,
                     freeflow_mode=True,
                 )
             )
-        macro_plan.add(
-            BuildWorkers(to_count=18 if not self._proxy_spines_completed else 17)
-        )
+            if auto_supply:
+                macro_plan.add(AutoSupply(self.ai.start_location))
+            if tech_pool:
+                macro_plan.add(
+                    TechUp(
+                        desired_tech=UnitTypeId.SPAWNINGPOOL,
+                        base_location=self.ai.start_location,
+                    )
+                )
+            if tech_warren:
+                macro_plan.add(
+                    TechUp(
+                        desired_tech=UnitTypeId.ROACHWARREN,
+                        base_location=self.ai.start_location,
+                    )
+                )
+            if need_queens:
+                macro_plan.add(
+                    SpawnController(
+                        army_composition_dict={
+                            UnitTypeId.QUEEN: {"proportion": 1.0, "priority": 0}
+                        },
+                        spawn_target=self._proxy_hatch_location,
+                        freeflow_mode=True,
+                    )
+                )
+            macro_plan.add(BuildWorkers(to_count=18 if not spines_completed else 17))
+            if spines_completed:
+                macro_plan.add(GasBuildingController(to_count=2))
+            return macro_plan
 
-        if self._proxy_spines_completed:
-            macro_plan.add(GasBuildingController(to_count=2))
-        self.ai.register_behavior(macro_plan)
+        self.ai.register_behavior(
+            self.macro_plan_cache.get(
+                (
+                    has_gas,
+                    auto_supply,
+                    tech_pool,
+                    tech_warren,
+                    need_queens,
+                    spines_completed,
+                ),
+                _build,
+            )
+        )
 
     def _micro(self, attack_target: Point2) -> None:
         self._combat_queens.execute(
@@ -192,7 +216,7 @@ class ProxyHatch(OpeningBase):
         )
         if self._proxy_hatch_started and self._proxy_spines_completed:
             for drone in proxy_drones:
-                self.ai.mediator.assign_role(tag=drone.tag, role=UnitRole.GATHERING)
+                self.ai.role_assigner.assign(drone.tag, UnitRole.GATHERING)
             return
 
         if len(self.ai.townhalls) >= 2:
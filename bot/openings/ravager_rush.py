@@ -21,14 +21,14 @@ from bot.combat.base_combat import BaseCombat
 from bot.combat.high_ground_spotters import HighGroundSpotters
 from bot.combat.ravager_combat import RavagerCombat
 from bot.consts import COMMON_UNIT_IGNORE_TYPES
-from bot.openings.opening_base import OpeningBase
-from bot.openings.ultras import Ultras
+from bot.lazy_opening import LazyOpening
+from bot.openings.opening_base import MACRO_CADENCE, OpeningBase
 
 
 class RavagerRush(OpeningBase):
     _ravager_combat: BaseCombat
     _high_ground_spotters: HighGroundSpotters
-    _ultras: OpeningBase
+    _ultras: LazyOpening
 
     def __init__(self):
         super().__init__()
@@ -52,8 +52,8 @@ class RavagerRush(OpeningBase):
         await super().on_start(ai)
         self._high_ground_spotters = HighGroundSpotters(ai, ai.config, ai.mediator)
         self._ravager_combat = RavagerCombat(ai, ai.config, ai.mediator)
-        self._ultras = Ultras()
-        await self._ultras.on_start(ai)
+        self._ultras = LazyOpening(ai, "Ultras")
+        self.scheduler.add("macro", MACRO_CADENCE, urgent=True)
 
         for ol in self.ai.units(UnitTypeId.OVERLORD):
             self.ai.mediator.assign_role(tag=ol.tag, role=UnitRole.HIGH_GROUND_SPOTTER)
@@ -78,10 +78,13 @@ class RavagerRush(OpeningBase):
             not in {"ProxyHatch", "ProxyHatchVariation"}
             and not self._transitioned
         ):
+            if self.ai.supply_army >= 20:
+                self._ultras.warm()
             if self.can_transition():
                 logger.info(f"{self.ai.time_formatted} - Transitioning to ultras")
                 self._transitioned = True
-            self._macro()
+            if self.scheduler.due("macro"):
+                self._macro()
         elif self._transitioned:
             await self._ultras.on_step(target)
         self._micro()
@@ -109,34 +112,48 @@ class RavagerRush(OpeningBase):
         num_gatherers: int = len(
             self.ai.mediator.get_units_from_role(role=UnitRole.GATHERING)
         )
-        macro_plan: MacroPlan = MacroPlan()
         skip_supply: bool = num_gatherers < 6 and self.ai.supply_left > 0
-        if not skip_supply:
-            macro_plan.add(AutoSupply(self.ai.start_location))
-        macro_plan.add(
-            SpawnController(army_composition_dict=self.army_comp, freeflow_mode=True)
+        # army comp changes with our gas
+        has_gas: bool = self.ai.vespene > 100
+        tech_up: bool = self.ai.minerals >= 150
+        worker_target: int = (
+            14 + num_non_gatherers
+            if len(self.ai.townhalls) < 2
+            else min(80, len(self.ai.townhalls) * 22)
         )
-        if self.ai.minerals >= 150:
+        expand: bool = self.ai.supply_army >= 10 and self.ai.minerals >= 250
+        take_gas: bool = num_gatherers > 11
+
+        def _build() -> MacroPlan:
+            macro_plan: MacroPlan = MacroPlan()
+            if not skip_supply:
+                macro_plan.add(AutoSupply(self.ai.start_location))
             macro_plan.add(
-                TechUp(
-                    desired_tech=UnitTypeId.ROACHWARREN,
-                    base_location=self.ai.start_location,
+                SpawnController(
+                    army_composition_dict=self.army_comp, freeflow_mode=True
                 )
             )
-        macro_plan.add(
-            BuildWorkers(
-                to_count=14 + num_non_gatherers
-                if len(self.ai.townhalls) < 2
-                else min(80, len(self.ai.townhalls) * 22)
+            if tech_up:
+                macro_plan.add(
+                    TechUp(
+                        desired_tech=UnitTypeId.ROACHWARREN,
+                        base_location=self.ai.start_location,
+                    )
+                )
+            macro_plan.add(BuildWorkers(to_count=worker_target))
+            if expand:
+                macro_plan.add(ExpansionController(to_count=16))
+            if take_gas:
+                macro_plan.add(GasBuildingController(to_count=32))
+            return macro_plan
+
+        self.ai.register_behavior(
+            self.macro_plan_cache.get(
+                (skip_supply, has_gas, tech_up, worker_target, expand, take_gas),
+                _build,
             )
         )
 
-        if self.ai.supply_army >= 10 and self.ai.minerals >= 250:
-            macro_plan.add(ExpansionController(to_count=16))
-        if num_gatherers > 11:
-            macro_plan.add(GasBuildingController(to_count=32))
-        self.ai.register_behavior(macro_plan)
-
     def _micro(self):
         hg_spotters: Units = self.ai.mediator.get_units_from_role(
             role=UnitRole.HIGH_GROUND_SPOTTER
@@ -153,7 +170,7 @@ class RavagerRush(OpeningBase):
                 roach.attack(squad_target)
 
         for ravager in self.ai.mediator.get_own_army_dict[UnitTypeId.RAVAGER]:
-            self.ai.mediator.assign_role(tag=ravager.tag, role=UnitRole.ATTACKING)
+            self.ai.role_assigner.assign(ravager.tag, UnitRole.ATTACKING)
 
         squads: list[UnitSquad] = self.ai.mediator.get_squads(
             role=UnitRole.ATTACKING, squad_radius=7.5
@@ -164,13 +181,25 @@ class RavagerRush(OpeningBase):
             pos_of_main_squad: Point2 = self.ai.mediator.get_position_of_main_squad(
                 role=UnitRole.ATTACKING
             )
+            active: np.ndarray = self.ai.micro_lod.is_active(
+                [squad.squad_position for squad in squads]
+            )
 
-            for squad in squads:
+            for i, squad in enumerate(squads):
                 target: Point2
                 if not squad.main_squad:
                     target = pos_of_main_squad
                 else:
                     target = squad_target
+
+                # nothing near, just walk the squad over
+                if not active[i]:
+                    if self.ai.micro_lod.transit_due(squad.squad_id):
+                        self.ai.micro_lod.follow_path(
+                            squad.squad_units, squad.squad_position, target, grid
+                        )
+                    continue
+
                 everything_near_squad: Units = (
                     self.ai.mediator.get_units_in_range(
                         start_points=[squad.squad_position],
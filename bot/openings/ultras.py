@@ -34,7 +34,7 @@ from bot.combat.infestor_combat import InfestorCombat
 from bot.combat.overlord_creep_spotters import OverlordCreepSpotters
 from bot.combat.queen_combat import QueenCombat
 from bot.consts import COMMON_UNIT_IGNORE_TYPES
-from bot.openings.opening_base import OpeningBase
+from bot.openings.opening_base import MACRO_CADENCE, UPGRADE_CADENCE, OpeningBase
 
 
 class AggroState(str, Enum):
@@ -98,15 +98,26 @@ class Ultras(OpeningBase):
 
         self._combat_queens = QueenCombat(ai, ai.config, ai.mediator)
         self._infestor_combat = InfestorCombat(ai, ai.config, ai.mediator)
+        self.scheduler.add("macro", MACRO_CADENCE, urgent=True)
+        self.scheduler.add("evo_chambers", UPGRADE_CADENCE)
 
+        # when transitioned into, overlords the previous opening gave a role
+        # (high ground spotters...) keep doing that job
+        tags_with_role: set[int] = set().union(
+            *self.ai.mediator.get_unit_role_dict.values()
+        )
         for unit in self.ai.units(UnitTypeId.OVERLORD):
-            self.ai.mediator.assign_role(
-                tag=unit.tag, role=UnitRole.OVERLORD_CREEP_SPOTTER
-            )
+            if unit.tag not in tags_with_role:
+                self.ai.mediator.assign_role(
+                    tag=unit.tag, role=UnitRole.OVERLORD_CREEP_SPOTTER
+                )
 
     async def on_step(self, target: Point2 | None = None) -> None:
         if self.ai.build_order_runner.build_completed:
-            self._macro()
+            if self.scheduler.due("macro"):
+                self._macro()
+            if self.scheduler.due("evo_chambers"):
+                self._build_evo_chambers()
 
         self._micro()
 
@@ -130,72 +141,24 @@ class Ultras(OpeningBase):
             self.ai.mediator.assign_role(tag=unit.tag, role=UnitRole.CONTROL_GROUP_TWO)
 
     def _macro(self) -> None:
-        macro_plan: MacroPlan = MacroPlan()
-        macro_plan.add(
-            TechUp(
-                desired_tech=UnitTypeId.ULTRALISKCAVERN,
-                base_location=self.ai.start_location,
-            )
+        num_townhalls: int = len(self.ai.townhalls)
+        freeflow: bool = (
+            self.ai.supply_used < 140
+            and not self.ai.mediator.get_own_structures_dict[UnitTypeId.ULTRALISKCAVERN]
+        ) or (self.ai.minerals >= 1500 and self.ai.vespene <= 200)
+        ignored_build_from_tags: frozenset[int] = frozenset(
+            s.tag for s in self.ai.townhalls if s.type_id != UnitTypeId.HATCHERY
         )
-        macro_plan.add(AutoSupply(self.ai.start_location))
-        macro_plan.add(
-            BuildWorkers(
-                to_count=22
-                if len(self.ai.townhalls) < 2
-                else min(80, len(self.ai.townhalls) * 22)
-            )
-        )
-        macro_plan.add(
-            SpawnController(
-                army_composition_dict=self.army_comp,
-                freeflow_mode=(
-                    self.ai.supply_used < 140
-                    and not self.ai.mediator.get_own_structures_dict[
-                        UnitTypeId.ULTRALISKCAVERN
-                    ]
-                )
-                or (self.ai.minerals >= 1500 and self.ai.vespene <= 200),
-                ignored_build_from_tags={
-                    s.tag for s in self.ai.townhalls if s.type_id != UnitTypeId.HATCHERY
-                },
-            )
-        )
-        if (
+        need_overseers: bool = (
             len(self.ai.mediator.get_own_army_dict[UnitTypeId.OVERSEER])
             + cy_unit_pending(self.ai, UnitTypeId.OVERSEER)
             < 2
-        ):
-            macro_plan.add(
-                SpawnController(
-                    army_composition_dict={
-                        UnitTypeId.OVERSEER: {"proportion": 1.0, "priority": 0}
-                    },
-                    freeflow_mode=True,
-                )
-            )
-        if len(self.ai.gas_buildings) >= 4:
-            if (
-                len(
-                    self.ai.mediator.get_own_structures_dict[
-                        UnitTypeId.EVOLUTIONCHAMBER
-                    ]
-                )
-                + self.ai.structure_pending(UnitTypeId.EVOLUTIONCHAMBER)
-                < 2
-            ):
-                self.ai.register_behavior(
-                    BuildStructure(self.ai.start_location, UnitTypeId.EVOLUTIONCHAMBER)
-                )
-            macro_plan.add(
-                UpgradeController(
-                    upgrade_list=self.required_upgrades,
-                    base_location=self.ai.start_location,
-                )
-            )
-        if self.ai.time >= 200.0:
-            macro_plan.add(ExpansionController(to_count=16))
+        )
+        upgrade: bool = len(self.ai.gas_buildings) >= 4
+        expand: bool = self.ai.time >= 200.0
+        num_gas: int = 0
         if self.ai.supply_workers >= 25:
-            num_gas: int = (
+            num_gas = (
                 1
                 if self.ai.supply_workers < 38
                 else (
@@ -205,8 +168,77 @@ class Ultras(OpeningBase):
                     else 4
                 )
             )
-            macro_plan.add(GasBuildingController(to_count=num_gas, max_pending=2))
-        self.ai.register_behavior(macro_plan)
+
+        def _build() -> MacroPlan:
+            macro_plan: MacroPlan = MacroPlan()
+            macro_plan.add(
+                TechUp(
+                    desired_tech=UnitTypeId.ULTRALISKCAVERN,
+                    base_location=self.ai.start_location,
+                )
+            )
+            macro_plan.add(AutoSupply(self.ai.start_location))
+            macro_plan.add(
+                BuildWorkers(
+                    to_count=22 if num_townhalls < 2 else min(80, num_townhalls * 22)
+                )
+            )
+            macro_plan.add(
+                SpawnController(
+                    army_composition_dict=self.army_comp,
+                    freeflow_mode=freeflow,
+                    ignored_build_from_tags=set(ignored_build_from_tags),
+                )
+            )
+            if need_overseers:
+                macro_plan.add(
+                    SpawnController(
+                        army_composition_dict={
+                            UnitTypeId.OVERSEER: {"proportion": 1.0, "priority": 0}
+                        },
+                        freeflow_mode=True,
+                    )
+                )
+            if upgrade:
+                macro_plan.add(
+                    UpgradeController(
+                        upgrade_list=self.required_upgrades,
+                        base_location=self.ai.start_location,
+                    )
+                )
+            if expand:
+                macro_plan.add(ExpansionController(to_count=16))
+            if num_gas:
+                macro_plan.add(GasBuildingController(to_count=num_gas, max_pending=2))
+            return macro_plan
+
+        self.ai.register_behavior(
+            self.macro_plan_cache.get(
+                (
+                    num_townhalls,
+                    freeflow,
+                    ignored_build_from_tags,
+                    need_overseers,
+                    upgrade,
+                    expand,
+                    num_gas,
+                ),
+                _build,
+            )
+        )
+
+    def _build_evo_chambers(self) -> None:
+        if len(self.ai.gas_buildings) < 4:
+            return
+
+        if (
+            len(self.ai.mediator.get_own_structures_dict[UnitTypeId.EVOLUTIONCHAMBER])
+            + self.ai.structure_pending(UnitTypeId.EVOLUTIONCHAMBER)
+            < 2
+        ):
+            self.ai.register_behavior(
+                BuildStructure(self.ai.start_location, UnitTypeId.EVOLUTIONCHAMBER)
+            )
 
     def _micro(self):
         queens_can_fight: bool = (
@@ -216,7 +248,7 @@ class Ultras(OpeningBase):
         )
 
         for unit in self.ai.mediator.get_own_army_dict[UnitTypeId.OVERSEER]:
-            self.ai.mediator.assign_role(tag=unit.tag, role=UnitRole.CONTROL_GROUP_TWO)
+            self.ai.role_assigner.assign(unit.tag, UnitRole.CONTROL_GROUP_TWO)
 
         self._combat_queens.execute(
             self.ai.mediator.get_units_from_role(role=UnitRole.QUEEN_OFFENSIVE),
@@ -234,13 +266,25 @@ class Ultras(OpeningBase):
             role=UnitRole.CONTROL_GROUP_TWO
         )
         squad_target: Point2 = self.main_target
+        active: np.ndarray = self.ai.micro_lod.is_active(
+            [squad.squad_position for squad in squads]
+        )
 
-        for squad in squads:
+        for i, squad in enumerate(squads):
             target: Point2
             if not squad.main_squad:
                 target = pos_of_main_squad
             else:
                 target = squad_target
+
+            # nothing near, just walk the squad over
+            if not active[i]:
+                if self.ai.micro_lod.transit_due(squad.squad_id):
+                    self.ai.micro_lod.follow_path(
+                        squad.squad_units, squad.squad_position, target, grid
+                    )
+                continue
+
             everything_near_squad: Units = (
                 self.ai.mediator.get_units_in_range(
                     start_points=[squad.squad_position],
@@ -0,0 +1,70 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+from sc2.position import Point2
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+@dataclass
+class PositionSafety:
+    """Batched version of `mediator.is_position_safe`.
+
+    The safe/unsafe mask of a grid is worked out the first time that grid
+    is queried in a frame, after which any number of positions can be
+    checked with a single numpy index.
+
+    Called from `bot/main.py`
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    weight_safety_limit : float
+        Tiles with a cost at or below this are considered safe, same
+        default as ares
+    """
+
+    ai: "AresBot"
+    weight_safety_limit: float = 1.0
+    _game_loop: int = -1
+    _safe_masks: dict[int, tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)
+
+    def are_positions_safe(
+        self, grid: np.ndarray, positions: np.ndarray | list[Point2]
+    ) -> np.ndarray:
+        """Check an (N, 2) array of positions against `grid`.
+
+        Returns
+        -------
+        np.ndarray :
+            Boolean vector, True where the position is safe.
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        if positions.shape[0] == 0:
+            return np.zeros(0, dtype=bool)
+        mask: np.ndarray = self._safe_mask(grid)
+        idx: np.ndarray = np.rint(positions).astype(np.intp)
+        np.clip(idx[:, 0], 0, mask.shape[0] - 1, out=idx[:, 0])
+        np.clip(idx[:, 1], 0, mask.shape[1] - 1, out=idx[:, 1])
+        return mask[idx[:, 0], idx[:, 1]]
+
+    def is_position_safe(self, grid: np.ndarray, position: Point2) -> bool:
+        return bool(self.are_positions_safe(grid, [position])[0])
+
+    def _safe_mask(self, grid: np.ndarray) -> np.ndarray:
+        game_loop: int = self.ai.state.game_loop
+        if game_loop != self._game_loop:
+            self._game_loop = game_loop
+            self._safe_masks.clear()
+
+        # keep a reference to the grid so its id can't be reused this frame
+        if (cached := self._safe_masks.get(id(grid))) and cached[0] is grid:
+            return cached[1]
+
+        # an infinite cost is unpathable rather than dangerous, same as ares
+        mask: np.ndarray = (grid == np.inf) | (grid <= self.weight_safety_limit)
+        self._safe_masks[id(grid)] = (grid, mask)
+        return mask
@@ -6,6 +6,7 @@ from sc2.units import Units
 from bot.combat.base_combat import BaseCombat
 from bot.combat.inject_queens import InjectQueens
 from bot.combat.queen_combat import QueenCombat
+from bot.inject_scheduler import InjectScheduler
 from bot.queen_role_controller import QueenRoleController
 
 
@@ -17,6 +18,10 @@ class QueenManager:
         self.ai: AresBot = ai
         # controller to manage the queen roles
         self._queen_role_controller = QueenRoleController(ai)
+        # shares the queen to townhall pairs with the role controller
+        self._inject_scheduler = InjectScheduler(
+            ai, self._queen_role_controller.inject_queen_to_th
+        )
 
         # combat classes
         self._defence_queens_control: BaseCombat = QueenCombat(
@@ -35,17 +40,21 @@ class QueenManager:
             role=UnitRole.QUEEN_INJECT
         )
 
+        self._inject_scheduler.sync(inject_queens)
+
         # dynamically adjust existing queen roles
         self._queen_role_controller.update(inject_queens, defence_queens)
 
         # control queens
         self._inject_queens_control.execute(
-            inject_queens,
-            inject_q_to_th_tags=self._queen_role_controller.inject_queen_to_th,
+            inject_queens, inject_scheduler=self._inject_scheduler
         )
 
         # self._defence_queens_control.execute(defence_queens)
 
+    def on_unit_destroyed(self, unit_tag: int) -> None:
+        self._inject_scheduler.remove(unit_tag)
+
     def assign_new_queen(self, queen: Unit) -> None:
         """
         Assign a new queen to a role
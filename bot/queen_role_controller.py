@@ -27,23 +27,20 @@ class QueenRoleController:
     def required_creep_spreaders(self) -> int:
         if (
             self.ai.mediator.get_creep_coverage > 85.0
-            or len(
-                self.ai.mediator.get_own_structures_dict[UnitTypeId.CREEPTUMORBURROWED]
-            )
-            > 25
+            or self.ai.tumor_index.count(UnitTypeId.CREEPTUMORBURROWED) > 25
         ):
             return 0
 
         ground_threats = self.ai.mediator.get_main_ground_threats_near_townhall
         if ground_threats and (
-            self.ai.get_total_supply(ground_threats) >= 4.0
+            self.ai.supply_tracker.supply_of(ground_threats) >= 4.0
             or ground_threats({UnitTypeId.ADEPT, UnitTypeId.REAPER})
         ):
             return 0
 
         if (
             self.ai.mediator.get_main_air_threats_near_townhall
-            and self.ai.get_total_supply(
+            and self.ai.supply_tracker.supply_of(
                 self.ai.mediator.get_main_air_threats_near_townhall
             )
             >= 6.0
@@ -51,9 +48,7 @@ class QueenRoleController:
             return 0
 
         num_queens: int = len(self.ai.mediator.get_own_army_dict[UnitTypeId.QUEEN])
-        known_enemy_supply: float = self.ai.get_total_supply(
-            self.ai.mediator.get_cached_enemy_army
-        )
+        known_enemy_supply: float = self.ai.supply_tracker.enemy_supply
         if (
             known_enemy_supply / 0.8
         ) > num_queens * 2 or self.ai.mediator.get_did_enemy_rush:
@@ -79,9 +74,7 @@ class QueenRoleController:
                 logger.info(f"{self.ai.time_formatted} - Detected rush")
             return num_queens
 
-        known_enemy_supply: float = self.ai.get_total_supply(
-            self.ai.mediator.get_cached_enemy_army
-        )
+        known_enemy_supply: float = self.ai.supply_tracker.enemy_supply
         if known_enemy_supply >= 10 and known_enemy_supply > num_queens * 2:
             return num_queens
 
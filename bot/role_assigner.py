@@ -0,0 +1,56 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Optional
+
+from ares.consts import UnitRole
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+RoleListener = Callable[[int, Optional[UnitRole], UnitRole], None]
+
+
+@dataclass
+class RoleAssigner:
+    """Front end to `mediator.assign_role` that only acts on real changes.
+
+    Openings assign roles every step for whole unit groups, most of which
+    already have that role. Those assignments are skipped here, checked
+    against the mediator's own role dict so changes made elsewhere are
+    still respected. Real changes are passed on to the mediator and
+    reported to any listener as `(tag, previous_role, new_role)`.
+    `previous_role` is the last role assigned through here, or None.
+
+    Called from `bot/main.py`
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    """
+
+    ai: "AresBot"
+    _roles: dict[int, UnitRole] = field(default_factory=dict)
+    _listeners: list[RoleListener] = field(default_factory=list)
+
+    def assign(self, tag: int, role: UnitRole) -> bool:
+        """Assign `role` to `tag`, returning True if the role changed."""
+        if tag in self.ai.mediator.get_unit_role_dict.get(role, ()):
+            self._roles[tag] = role
+            return False
+
+        previous_role: UnitRole | None = self._roles.get(tag)
+        self.ai.mediator.assign_role(tag=tag, role=role)
+        self._roles[tag] = role
+        for listener in self._listeners:
+            listener(tag, previous_role, role)
+        return True
+
+    def subscribe(self, listener: RoleListener) -> None:
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: RoleListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def remove(self, tag: int) -> None:
+        self._roles.pop(tag, None)
@@ -0,0 +1,102 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from ares.consts import ALL_STRUCTURES, WORKER_TYPES
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.unit import Unit
+from sc2.units import Units
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+@dataclass
+class SupplyTracker:
+    """Running tally of the enemy army supply we know about.
+
+    Enemy army units are added when they enter vision and removed when
+    they die, so `enemy_supply` and `enemy_count` cost nothing to read.
+    Units dropping out of ares' unit memory don't have an event, so the
+    tally is resynced from `mediator.get_cached_enemy_army` whenever its
+    size disagrees with ours, and every `resync_every` game loops to
+    catch enemy units morphing into another type.
+
+    Called from `bot/main.py`
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    resync_every : int
+        Game loops between full resyncs
+    """
+
+    ai: "AresBot"
+    resync_every: int = 44
+    enemy_supply: float = 0.0
+    _enemy_units: dict[int, UnitTypeId] = field(default_factory=dict)
+    _enemy_type_counts: dict[UnitTypeId, int] = field(default_factory=dict)
+    _type_supply: dict[UnitTypeId, float] = field(default_factory=dict)
+    _last_sync: int = -1
+
+    def update(self) -> None:
+        """Resync if we have drifted from ares, cheap when we haven't.
+
+        Called every step from `bot/main.py`
+        """
+        enemy_army: Units = self.ai.mediator.get_cached_enemy_army
+        game_loop: int = self.ai.state.game_loop
+        if (
+            len(enemy_army) != len(self._enemy_units)
+            or self._last_sync < 0
+            or game_loop - self._last_sync >= self.resync_every
+        ):
+            self._sync(enemy_army)
+
+    def add(self, unit: Unit) -> None:
+        if (
+            unit.tag in self._enemy_units
+            or unit.type_id in ALL_STRUCTURES
+            or unit.type_id in WORKER_TYPES
+        ):
+            return
+        self._enemy_units[unit.tag] = unit.type_id
+        self._enemy_type_counts[unit.type_id] = (
+            self._enemy_type_counts.get(unit.type_id, 0) + 1
+        )
+        self.enemy_supply += self.type_supply(unit)
+
+    def remove(self, tag: int) -> None:
+        if (type_id := self._enemy_units.pop(tag, None)) is None:
+            return
+        self._enemy_type_counts[type_id] -= 1
+        self.enemy_supply -= self._type_supply[type_id]
+
+    @property
+    def enemy_count(self) -> int:
+        return len(self._enemy_units)
+
+    def enemy_type_count(self, type_id: UnitTypeId) -> int:
+        return self._enemy_type_counts.get(type_id, 0)
+
+    def type_supply(self, unit: Unit) -> float:
+        """Supply of `unit`'s type, asking ares the first time we see it."""
+        if (supply := self._type_supply.get(unit.type_id)) is None:
+            supply = self._type_supply[unit.type_id] = self.ai.get_total_supply([unit])
+        return supply
+
+    def supply_of(self, units: Units | list[Unit]) -> float:
+        """Same as `ai.get_total_supply`, using the per type cache."""
+        return sum(self.type_supply(u) for u in units)
+
+    def _sync(self, enemy_army: Units) -> None:
+        self._last_sync = self.ai.state.game_loop
+        self._enemy_units.clear()
+        self._enemy_type_counts.clear()
+        self.enemy_supply = 0.0
+        for unit in enemy_army:
+            self._enemy_units[unit.tag] = unit.type_id
+            self._enemy_type_counts[unit.type_id] = (
+                self._enemy_type_counts.get(unit.type_id, 0) + 1
+            )
+            self.enemy_supply += self.type_supply(unit)
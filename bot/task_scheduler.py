@@ -0,0 +1,90 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+@dataclass
+class ScheduledTask:
+    """Cadence and run state of one scheduled task.
+
+    Parameters
+    ----------
+    cadence : int
+        Run at most once every `cadence` game loops
+    offset : int
+        Shifts the loops this task is due on, to spread tasks across frames
+    urgent : bool
+        Run straight away when the scheduler is told something urgent happened
+    """
+
+    cadence: int
+    offset: int
+    urgent: bool
+    last_period: int | None = None
+    last_game_loop: int = -1
+
+
+@dataclass
+class TaskScheduler:
+    """Let opening tasks run at their own cadence instead of every step.
+
+    Each task is added once with a cadence in game loops, then asked
+    whether it's `due` from `on_step`. Tasks with the same cadence are
+    given different offsets so they don't all land on the same frame,
+    offsets are a multiple of the game step so each lands on a step.
+    When `is_urgent` becomes True, any task added with `urgent=True` is
+    due on that frame regardless of its cadence.
+
+    Created in `OpeningBase.on_start`
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    is_urgent : Callable[[], bool]
+        Checked once per frame, urgent tasks are forced when this turns True
+    """
+
+    ai: "AresBot"
+    is_urgent: Callable[[], bool] = lambda: False
+    _tasks: dict[str, ScheduledTask] = field(default_factory=dict)
+    _game_loop: int = -1
+    _was_urgent: bool = False
+    _force_urgent: bool = False
+
+    def add(self, name: str, cadence: int, urgent: bool = False) -> None:
+        offset: int = 0
+        if cadence > 1:
+            num_staggered: int = sum(1 for t in self._tasks.values() if t.cadence > 1)
+            game_step: int = max(1, self.ai.client.game_step)
+            offset = (num_staggered * game_step) % cadence
+        self._tasks[name] = ScheduledTask(cadence, offset, urgent)
+
+    def due(self, name: str) -> bool:
+        """Check if task `name` should run this frame, marking it as run if so."""
+        self._refresh()
+        game_loop: int = self.ai.state.game_loop
+        task: ScheduledTask = self._tasks[name]
+        if task.last_game_loop == game_loop:
+            return False
+
+        # tasks are due once per period, so a late or uneven step
+        # doesn't push the following runs back
+        period: int = max(0, (game_loop - task.offset) // task.cadence)
+        if period == task.last_period and not (task.urgent and self._force_urgent):
+            return False
+
+        task.last_period = period
+        task.last_game_loop = game_loop
+        return True
+
+    def _refresh(self) -> None:
+        game_loop: int = self.ai.state.game_loop
+        if game_loop == self._game_loop:
+            return
+        self._game_loop = game_loop
+        urgent: bool = self.is_urgent()
+        self._force_urgent = urgent and not self._was_urgent
+        self._was_urgent = urgent
@@ -0,0 +1,218 @@
+from dataclasses import dataclass, field
+from math import ceil
+from typing import TYPE_CHECKING, Iterator
+
+from cython_extensions import cy_distance_to_squared
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+from sc2.unit import Unit
+from sc2.unit_command import UnitCommand
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+TUMOR_TYPES: set[UnitTypeId] = {
+    UnitTypeId.CREEPTUMOR,
+    UnitTypeId.CREEPTUMORBURROWED,
+    UnitTypeId.CREEPTUMORQUEEN,
+}
+# a burrowed tumor can place its one child this far away
+TUMOR_SPREAD_RANGE: float = 10.5
+SPREAD_ABILITIES: set[AbilityId] = {
+    AbilityId.BUILD_CREEPTUMOR,
+    AbilityId.BUILD_CREEPTUMOR_TUMOR,
+}
+
+
+@dataclass
+class TumorIndex:
+    """Coarse grid of our creep tumors, kept up to date from unit events.
+
+    Tumors never move, so each tumor is bucketed once into a grid cell of
+    `cell_size` and spacing checks only look at the handful of cells
+    around the query point.
+
+    Also tracks which burrowed tumors can still spread. Every tumor may
+    spawn a single child, after which it is spent for the rest of the game.
+    A tumor is spent as soon as it has an order, or when a child appears
+    within range of it after it was ordered to spread and `confirm_spent`
+    shows it lost the ability to spread. The ability check is always made,
+    as the actual parent may already be spent from its order, leaving a
+    sibling as the only tumor in range.
+
+    Called from `bot/main.py`
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+    cell_size : float
+        Width of a grid cell in game units
+    """
+
+    ai: "AresBot"
+    cell_size: float = 12.0
+    _cells: dict[tuple[int, int], set[int]] = field(default_factory=dict)
+    _tumors: dict[int, tuple[Point2, UnitTypeId]] = field(default_factory=dict)
+    _type_counts: dict[UnitTypeId, int] = field(default_factory=dict)
+    _active: set[int] = field(default_factory=set)
+    _spent: set[int] = field(default_factory=set)
+    _spreading: set[int] = field(default_factory=set)
+    _unconfirmed: set[int] = field(default_factory=set)
+
+    def update(self) -> None:
+        """Rebuild if we have drifted from the observation, should be rare.
+
+        Called every step from `bot/main.py`
+        """
+        structures_dict: dict[
+            UnitTypeId, list[Unit]
+        ] = self.ai.mediator.get_own_structures_dict
+        num_tumors: int = sum(len(structures_dict[t]) for t in TUMOR_TYPES)
+        if num_tumors != len(self._tumors):
+            self._sync()
+
+    def add(self, unit: Unit) -> None:
+        if unit.type_id not in TUMOR_TYPES or unit.tag in self._tumors:
+            return
+        position: Point2 = unit.position
+        self._tumors[unit.tag] = (position, unit.type_id)
+        self._cells.setdefault(self._cell(position), set()).add(unit.tag)
+        self._type_counts[unit.type_id] = self._type_counts.get(unit.type_id, 0) + 1
+        self._on_new_type(unit)
+
+    def remove(self, tag: int) -> None:
+        if tag not in self._tumors:
+            return
+        position, type_id = self._tumors.pop(tag)
+        cell: tuple[int, int] = self._cell(position)
+        self._cells[cell].discard(tag)
+        if not self._cells[cell]:
+            del self._cells[cell]
+        self._type_counts[type_id] -= 1
+        self._active.discard(tag)
+        self._spent.discard(tag)
+        self._spreading.discard(tag)
+        self._unconfirmed.discard(tag)
+
+    def update_type(self, unit: Unit) -> None:
+        """Tumors change type when they finish and burrow."""
+        if unit.tag not in self._tumors:
+            self.add(unit)
+            return
+        position, previous_type = self._tumors[unit.tag]
+        if previous_type == unit.type_id:
+            return
+        self._tumors[unit.tag] = (position, unit.type_id)
+        self._type_counts[previous_type] -= 1
+        self._type_counts[unit.type_id] = self._type_counts.get(unit.type_id, 0) + 1
+        self._on_new_type(unit)
+
+    def active_tumors(self) -> list[Unit]:
+        """Burrowed tumors that have not spread yet."""
+        active: list[Unit] = []
+        for tag in list(self._active):
+            if not (tumor := self.ai.unit_tag_dict.get(tag)):
+                continue
+            # already placing its child
+            if tumor.orders:
+                self._mark_spent(tag)
+                continue
+            active.append(tumor)
+        return active
+
+    def set_spreading(self, actions: list[UnitCommand]) -> None:
+        """Record the tumors that were ordered to spread this step."""
+        self._spreading = {
+            action.unit.tag
+            for action in actions
+            if action.ability in SPREAD_ABILITIES and action.unit.tag in self._active
+        }
+
+    async def confirm_spent(self) -> None:
+        """Check which possible parents of new tumors can no longer spread."""
+        if not self._unconfirmed:
+            return
+        tumors: list[Unit] = [
+            tumor
+            for tag in self._unconfirmed
+            if (tumor := self.ai.unit_tag_dict.get(tag))
+        ]
+        self._unconfirmed.clear()
+        if not tumors:
+            return
+        abilities: list[list[AbilityId]] = await self.ai.get_available_abilities(tumors)
+        for tumor, tumor_abilities in zip(tumors, abilities):
+            if AbilityId.BUILD_CREEPTUMOR_TUMOR not in tumor_abilities:
+                self._mark_spent(tumor.tag)
+
+    def count(self, type_id: UnitTypeId) -> int:
+        return self._type_counts.get(type_id, 0)
+
+    def any_within(
+        self,
+        position: Point2,
+        distance: float,
+        type_ids: set[UnitTypeId] | None = None,
+    ) -> bool:
+        """Check if any tumor of `type_ids` is closer than `distance`."""
+        distance_sq: float = distance * distance
+        for tag in self._tags_near(position, distance):
+            tumor_pos, type_id = self._tumors[tag]
+            if type_ids and type_id not in type_ids:
+                continue
+            if cy_distance_to_squared(tumor_pos, position) < distance_sq:
+                return True
+        return False
+
+    def _on_new_type(self, unit: Unit) -> None:
+        if unit.type_id == UnitTypeId.CREEPTUMORBURROWED:
+            if unit.tag not in self._spent:
+                self._active.add(unit.tag)
+        # a tumor spawned by another tumor, one of those in range may be spent
+        elif unit.type_id == UnitTypeId.CREEPTUMOR:
+            self._unconfirmed.update(self._possible_parents(unit.position))
+
+    def _mark_spent(self, tag: int) -> None:
+        self._active.discard(tag)
+        self._spent.add(tag)
+
+    def _possible_parents(self, position: Point2) -> list[int]:
+        range_sq: float = TUMOR_SPREAD_RANGE**2
+        return [
+            tag
+            for tag in self._tags_near(position, TUMOR_SPREAD_RANGE)
+            if tag in self._active
+            and tag in self._spreading
+            and cy_distance_to_squared(self._tumors[tag][0], position) <= range_sq
+        ]
+
+    def _tags_near(self, position: Point2, distance: float) -> Iterator[int]:
+        cell_x, cell_y = self._cell(position)
+        reach: int = ceil(distance / self.cell_size)
+        for x in range(cell_x - reach, cell_x + reach + 1):
+            for y in range(cell_y - reach, cell_y + reach + 1):
+                yield from self._cells.get((x, y), ())
+
+    def _cell(self, position: Point2) -> tuple[int, int]:
+        return int(position[0] // self.cell_size), int(position[1] // self.cell_size)
+
+    def _sync(self) -> None:
+        structures_dict: dict[
+            UnitTypeId, list[Unit]
+        ] = self.ai.mediator.get_own_structures_dict
+        # burrowed first, so new children can find their parent
+        current: dict[int, Unit] = {
+            tumor.tag: tumor
+            for type_id in (
+                UnitTypeId.CREEPTUMORBURROWED,
+                UnitTypeId.CREEPTUMORQUEEN,
+                UnitTypeId.CREEPTUMOR,
+            )
+            for tumor in structures_dict[type_id]
+        }
+        for tag in [t for t in self._tumors if t not in current]:
+            self.remove(tag)
+        for tumor in current.values():
+            self.update_type(tumor)
@@ -0,0 +1,63 @@
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+import numpy as np
+from ares.consts import UnitTreeQueryType
+from cython_extensions import cy_find_units_center_mass
+from cython_extensions.dijkstra import DijkstraPathing, cy_dijkstra
+from sc2.position import Point2
+from sc2.units import Units
+
+from bot.combat.mutas_combat import MutasCombat
+
+if TYPE_CHECKING:
+    from ares import AresBot
+
+
+def warm_up_hot_paths(ai: "AresBot") -> float:
+    """Run the numeric code used in fights once before the game starts.
+
+    The first fight of a game used to be the slowest frame, as it was the
+    first time Dijkstra pathing, the unit tree queries and the muta stack
+    search ran. Here each of them runs once on the real map grids, using
+    our own starting units and the enemy spawn as inputs. Nothing
+    computed is kept.
+
+    Called from `bot/main.py`
+
+    Parameters
+    ----------
+    ai : AresBot
+        Bot object that will be running the game
+
+    Returns
+    -------
+    float :
+        Seconds spent warming up.
+    """
+    start: float = perf_counter()
+    own_spawn: Point2 = ai.start_location
+    enemy_spawn: Point2 = ai.enemy_start_locations[0]
+    workers: Units = ai.workers
+
+    for grid in (ai.mediator.get_air_grid, ai.mediator.get_ground_grid):
+        pathing: DijkstraPathing = cy_dijkstra(
+            grid,
+            np.array([enemy_spawn.rounded], dtype=np.intp),
+            checks_enabled=False,
+        )
+        pathing.get_path(own_spawn, 7)
+
+    if workers:
+        cy_find_units_center_mass(workers, 10.0)
+        ai.mediator.get_units_in_range(
+            start_points=[own_spawn],
+            distances=16.0,
+            query_tree=UnitTreeQueryType.AllOwn,
+            return_as_dict=False,
+        )
+        MutasCombat(ai, ai.config, ai.mediator)._get_stack_position(
+            workers, enemy_spawn, ai.mediator.get_air_grid
+        )
+
+    return perf_counter() - start
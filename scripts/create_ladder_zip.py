@@ -3,11 +3,21 @@ Zips the relevant files and directories so that Bot can be updated
 to ladder or tournaments.
 TODO: check all files and folders are present before zipping
 """
+import argparse
+import hashlib
+import importlib.util
+import json
+import marshal
 import os
 import platform
 import shutil
 import site
+import struct
+import sys
+import tempfile
 import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from os import path, remove, walk
 from subprocess import Popen, run
 from typing import Dict, List, Tuple
@@ -31,26 +41,59 @@ ZIP_FILES: List[str] = [
     "zerg_builds.yaml",
 ]
 if platform.system() == "Windows":
-    EXCLUDE: list[str] = [
+    EXCLUDE: Tuple[str, ...] = (
         "ares-sc2\\build",
         "ares-sc2\\dist",
         "ares-sc2\\tests",
         "ares-src\\docs",
         "map_analyzer\\pickle_gameinfo",
-    ]
+    )
     FILETYPES_TO_IGNORE: Tuple = (".c", ".so", "pyx", "pyi")
     ROOT_DIRECTORY = "./"
 else:
-    EXCLUDE: list[str] = [
+    EXCLUDE: Tuple[str, ...] = (
         "ares-sc2/build",
         "ares-sc2/dist",
         "ares-sc2/tests",
         "ares-sc2/docs",
         "map_analyzer/pickle_gameinfo",
-    ]
+    )
     FILETYPES_TO_IGNORE: Tuple = (".c", ".pyd", ".pyx", ".pyi")
     ROOT_DIRECTORY = "./"
 
+# directories that are never needed to run the bot, skipped wherever they appear
+PRUNE_DIRECTORIES: set[str] = {
+    ".git",
+    ".github",
+    "__pycache__",
+    "doc",
+    "docs",
+    "example",
+    "examples",
+    "test",
+    "tests",
+}
+# entry points stay as source so the ladder can run `python run.py`
+KEEP_SOURCE: set[str] = {"run.py"}
+# hash based pyc that is never checked against a source file
+PYC_FLAGS_UNCHECKED_HASH: int = 0b01
+
+# zip format details for `write_zip`, see section 4.3 of the PKWARE APPNOTE
+MANIFEST_SUFFIX: str = ".manifest.json"
+ZIP_COMPRESS_LEVEL: int = 6
+LOCAL_HEADER: struct.Struct = struct.Struct("<IHHHHHIIIHH")
+LOCAL_HEADER_SIGNATURE: int = 0x04034B50
+CENTRAL_HEADER: struct.Struct = struct.Struct("<IHHHHHHIIIHHHHHII")
+CENTRAL_HEADER_SIGNATURE: int = 0x02014B50
+END_OF_CENTRAL_DIRECTORY: struct.Struct = struct.Struct("<IHHHHIIH")
+END_OF_CENTRAL_DIRECTORY_SIGNATURE: int = 0x06054B50
+ZIP_VERSION: int = 20
+UNIX_HOST: int = 3 << 8
+UTF8_FLAG: int = 0x800
+# 1980-01-01 00:00, the earliest date a zip can hold
+FIXED_DOS_DATE: int = (1 << 5) | 1
+FILE_ATTRIBUTES: int = 0o100644 << 16
+
 ZIP_DIRECTORIES: Dict[str, Dict] = {
     "bot": {"zip_all": True, "folder_to_zip": "bot"},
     "ares-sc2": {"zip_all": True, "folder_to_zip": ""},
@@ -61,53 +104,292 @@ ZIP_DIRECTORIES: Dict[str, Dict] = {
 }
 
 
-def zip_dir(dir_path, zip_file):
+def compile_to_pyc(source: bytes, arcname: str, optimize: int) -> bytes:
     """
-    Will walk through a directory recursively and add all folders and files to zipfile
-    @param dir_path:
-    @param zip_file:
+    Compile python source to the contents of a sourceless .pyc file.
+    The pyc is hash based rather than timestamp based, so building the same
+    source twice gives the same bytes.
+    @param source: contents of the .py file
+    @param arcname: path shown in tracebacks
+    @param optimize: optimisation level, as for `compile`
     @return:
     """
-    for root, _, files in walk(dir_path):
-        if any(exclude in root for exclude in EXCLUDE):
-            continue
+    code = compile(source, arcname, "exec", dont_inherit=True, optimize=optimize)
+    return (
+        importlib.util.MAGIC_NUMBER
+        + PYC_FLAGS_UNCHECKED_HASH.to_bytes(4, "little")
+        + importlib.util.source_hash(source)
+        + marshal.dumps(code)
+    )
+
+
+def pack_entry(
+    source: bytes, arcname: str, to_pyc: bool, optimize: int
+) -> Tuple[int, int, bytes]:
+    """
+    Turn a file into a zip entry, run in the process pool.
+    @param source: contents of the file
+    @param arcname: path of the source file inside the zip
+    @param to_pyc: compile to bytecode first
+    @param optimize: optimisation level used when compiling
+    @return: crc32 and size of the uncompressed data, raw deflate stream
+    """
+    data: bytes = compile_to_pyc(source, arcname, optimize) if to_pyc else source
+    compressor = zlib.compressobj(ZIP_COMPRESS_LEVEL, zlib.DEFLATED, -15)
+    return (
+        zlib.crc32(data),
+        len(data),
+        compressor.compress(data) + compressor.flush(),
+    )
+
+
+def _pack_entry_star(args: Tuple[bytes, str, bool, int]) -> Tuple[int, int, bytes]:
+    return pack_entry(*args)
+
+
+def collect_dir(dir_path: str) -> List[Tuple[str, str]]:
+    """
+    Will walk through a directory recursively and find every file to zip,
+    excluded and pruned directories are not walked into
+    @param dir_path:
+    @return: (path on disk, path in the zip) for each file
+    """
+    files_to_zip: List[Tuple[str, str]] = []
+    for root, dirs, files in walk(dir_path):
+        dirs[:] = [
+            d
+            for d in dirs
+            if d not in PRUNE_DIRECTORIES and not path.join(root, d).endswith(EXCLUDE)
+        ]
         for file in files:
             if file.lower().endswith(FILETYPES_TO_IGNORE):
                 continue
-            zip_file.write(
-                path.join(root, file),
-                path.relpath(path.join(root, file), path.join(dir_path, "..")),
-            )
+            file_path: str = path.join(root, file)
+            arcname: str = path.relpath(file_path, path.join(dir_path, ".."))
+            files_to_zip.append((file_path, arcname.replace(os.sep, "/")))
+    return files_to_zip
 
 
-def zip_files_and_directories(zipfile_name: str) -> None:
+def collect_files() -> List[Tuple[str, str]]:
     """
-    @return:
+    Every file that goes in the zip, sorted by its path in the zip
+    @return: (path on disk, path in the zip) for each file
     """
-
-    path_to_zipfile = path.join(ROOT_DIRECTORY, zipfile_name)
-    # if the zip file already exists remove it
-    if path.isfile(path_to_zipfile):
-        remove(path_to_zipfile)
-    # create a new zip file
-    zip_file = zipfile.ZipFile(path_to_zipfile, "w", zipfile.ZIP_DEFLATED)
-
-    # write directories to the zipfile
+    files_to_zip: List[Tuple[str, str]] = []
     for directory, values in ZIP_DIRECTORIES.items():
         if values["zip_all"]:
-            zip_dir(path.join(ROOT_DIRECTORY, directory), zip_file)
+            files_to_zip.extend(collect_dir(path.join(ROOT_DIRECTORY, directory)))
         else:
             path_to_dir = path.join(ROOT_DIRECTORY, directory, values["folder_to_zip"])
-            zip_dir(path_to_dir, zip_file)
+            files_to_zip.extend(collect_dir(path_to_dir))
 
-    # write individual files
     for single_file in ZIP_FILES:
         _path: str = path.join(ROOT_DIRECTORY, single_file)
         if path.isfile(_path):
-            zip_file.write(_path, single_file)
+            files_to_zip.append((_path, single_file))
+
+    return sorted(files_to_zip, key=lambda f: f[1])
+
+
+def read_previous_entries(
+    path_to_zipfile: str, manifest_settings: Dict
+) -> Dict[str, Tuple[str, int, int, bytes]]:
+    """
+    Load the entries of the last zip built with the same settings, along
+    with the hash of the source each one was built from
+    @return: zip path to (source sha256, crc32, uncompressed size, raw deflate stream)
+    """
+    path_to_manifest: str = path_to_zipfile + MANIFEST_SUFFIX
+    if not path.isfile(path_to_zipfile) or not path.isfile(path_to_manifest):
+        return {}
+    with open(path_to_manifest) as f:
+        manifest: Dict = json.load(f)
+    if manifest.get("settings") != manifest_settings:
+        return {}
+
+    entries: Dict[str, Tuple[str, int, int, bytes]] = {}
+    with open(path_to_zipfile, "rb") as raw, zipfile.ZipFile(raw) as zip_file:
+        for info in zip_file.infolist():
+            if (
+                info.filename not in manifest["files"]
+                or info.compress_type != zipfile.ZIP_DEFLATED
+            ):
+                continue
+            # skip the local header to get at the compressed bytes
+            raw.seek(info.header_offset)
+            header: bytes = raw.read(LOCAL_HEADER.size)
+            name_length, extra_length = LOCAL_HEADER.unpack(header)[-2:]
+            raw.seek(name_length + extra_length, os.SEEK_CUR)
+            entries[info.filename] = (
+                manifest["files"][info.filename],
+                info.CRC,
+                info.file_size,
+                raw.read(info.compress_size),
+            )
+    return entries
+
 
-    # close the zip file
-    zip_file.close()
+def write_zip(path_to_zipfile: str, entries: List[Tuple[str, int, int, bytes]]) -> None:
+    """
+    Write already deflated entries to a zip, with fixed timestamps and
+    permissions so the same entries always give the same archive
+    @param path_to_zipfile:
+    @param entries: (zip path, crc32, uncompressed size, raw deflate stream)
+    """
+    if len(entries) >= 0xFFFF:
+        raise ValueError("Too many files for a zip without zip64 extensions")
+
+    central_directory: List[bytes] = []
+    with open(path_to_zipfile, "wb") as f:
+        for arcname, crc, file_size, compressed in entries:
+            name: bytes = arcname.encode("utf-8")
+            flags: int = 0 if name.isascii() else UTF8_FLAG
+            offset: int = f.tell()
+            f.write(
+                LOCAL_HEADER.pack(
+                    LOCAL_HEADER_SIGNATURE,
+                    ZIP_VERSION,
+                    flags,
+                    zipfile.ZIP_DEFLATED,
+                    0,
+                    FIXED_DOS_DATE,
+                    crc,
+                    len(compressed),
+                    file_size,
+                    len(name),
+                    0,
+                )
+            )
+            f.write(name)
+            f.write(compressed)
+            central_directory.append(
+                CENTRAL_HEADER.pack(
+                    CENTRAL_HEADER_SIGNATURE,
+                    ZIP_VERSION | UNIX_HOST,
+                    ZIP_VERSION,
+                    flags,
+                    zipfile.ZIP_DEFLATED,
+                    0,
+                    FIXED_DOS_DATE,
+                    crc,
+                    len(compressed),
+                    file_size,
+                    len(name),
+                    0,
+                    0,
+                    0,
+                    0,
+                    FILE_ATTRIBUTES,
+                    offset,
+                )
+                + name
+            )
+
+        central_directory_offset: int = f.tell()
+        for header in central_directory:
+            f.write(header)
+        f.write(
+            END_OF_CENTRAL_DIRECTORY.pack(
+                END_OF_CENTRAL_DIRECTORY_SIGNATURE,
+                0,
+                0,
+                len(entries),
+                len(entries),
+                f.tell() - central_directory_offset,
+                central_directory_offset,
+                0,
+            )
+        )
+
+
+def zip_files_and_directories(
+    zipfile_name: str, bytecode: bool = False, optimize: int = 1
+) -> None:
+    """
+    Build the zip, only compressing files that changed since the last build.
+    A manifest of source hashes is kept next to the zip, unchanged files
+    have their compressed data copied over from the previous zip and the
+    rest are compressed in parallel.
+    @param zipfile_name:
+    @param bytecode: ship python files as precompiled .pyc only, for the
+        python version running this script
+    @param optimize: optimisation level used when compiling
+    @return:
+    """
+    path_to_zipfile = path.join(ROOT_DIRECTORY, zipfile_name)
+    settings: Dict = {
+        "bytecode": bytecode,
+        "optimize": optimize,
+        "magic": importlib.util.MAGIC_NUMBER.hex(),
+        "level": ZIP_COMPRESS_LEVEL,
+    }
+    previous: Dict[str, Tuple[str, int, int, bytes]] = read_previous_entries(
+        path_to_zipfile, settings
+    )
+
+    arcnames: List[str] = []
+    hashes: Dict[str, str] = {}
+    entries: Dict[str, Tuple[str, int, int, bytes]] = {}
+    to_pack: List[Tuple[bytes, str, bool, int]] = []
+    to_pack_arcnames: List[str] = []
+    for file_path, arcname in collect_files():
+        to_pyc: bool = (
+            bytecode and arcname.endswith(".py") and arcname not in KEEP_SOURCE
+        )
+        out_arcname: str = arcname[:-3] + ".pyc" if to_pyc else arcname
+        with open(file_path, "rb") as f:
+            source: bytes = f.read()
+        sha256: str = hashlib.sha256(source).hexdigest()
+        arcnames.append(out_arcname)
+        hashes[out_arcname] = sha256
+
+        if (entry := previous.get(out_arcname)) and entry[0] == sha256:
+            entries[out_arcname] = (out_arcname, *entry[1:])
+        else:
+            to_pack.append((source, arcname, to_pyc, optimize))
+            to_pack_arcnames.append(out_arcname)
+
+    print(f"Reusing {len(entries)} unchanged files, packing {len(to_pack)}...")
+    if to_pack:
+        with ProcessPoolExecutor() as executor:
+            for out_arcname, packed in zip(
+                to_pack_arcnames,
+                executor.map(_pack_entry_star, to_pack, chunksize=16),
+            ):
+                entries[out_arcname] = (out_arcname, *packed)
+
+    # write to a temporary file first, a failed build keeps the last zip
+    path_to_tmp_zipfile: str = path_to_zipfile + ".tmp"
+    write_zip(path_to_tmp_zipfile, [entries[a] for a in arcnames])
+    os.replace(path_to_tmp_zipfile, path_to_zipfile)
+    with open(path_to_zipfile + MANIFEST_SUFFIX, "w") as f:
+        json.dump({"settings": settings, "files": hashes}, f, indent=2, sort_keys=True)
+
+
+def measure_cold_start(zipfile_name: str) -> float:
+    """
+    Unpack the zip somewhere fresh, as the ladder does, and time importing
+    `run.py` the first time, when nothing has been compiled yet.
+    @param zipfile_name:
+    @return: seconds taken
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with zipfile.ZipFile(path.join(ROOT_DIRECTORY, zipfile_name)) as zip_file:
+            zip_file.extractall(tmp_dir)
+        result = run(
+            [
+                sys.executable,
+                "-c",
+                "import time; start = time.perf_counter(); import run; "
+                "print(time.perf_counter() - start)",
+            ],
+            cwd=tmp_dir,
+            capture_output=True,
+            text=True,
+        )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing run.py from {zipfile_name} failed")
+    return float(result.stdout.strip().splitlines()[-1])
 
 
 def get_library_from_site_packages(library_name, project_directory):
@@ -156,6 +438,22 @@ def check_config_values():
         assert not config["Debug"], "Debug is not False"
 
 
+def check_build_orders():
+    """
+    Make sure every build order is valid, see `scripts/validate_builds.py`.
+    """
+    result = run(
+        [
+            "poetry",
+            "run",
+            "python",
+            path.join("scripts", "validate_builds.py"),
+        ],
+        cwd=ROOT_DIRECTORY,
+    )
+    assert result.returncode == 0, "Build orders are not valid"
+
+
 def get_zipfile_name() -> str:
     """Attempt to get bot name from config."""
     __user_config_location__: str = path.abspath(".")
@@ -233,6 +531,26 @@ def try_build_cython_extensions(build_env=None):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--bytecode",
+        action="store_true",
+        help="Ship precompiled .pyc files instead of .py sources",
+    )
+    parser.add_argument(
+        "--optimize",
+        type=int,
+        choices=[0, 1, 2],
+        default=1,
+        help="Optimisation level for --bytecode, as for python -O",
+    )
+    parser.add_argument(
+        "--measure",
+        action="store_true",
+        help="Report cold start time, compared to a source zip for --bytecode",
+    )
+    args = parser.parse_args()
+
     print("Cloning python-sc2...")
     destination_directory = os.path.join("../", "python-sc2")
     if os.path.exists(destination_directory):
@@ -318,11 +636,30 @@ if __name__ == "__main__":
     print("Checking config values...")
     check_config_values()
 
+    print("Checking build orders...")
+    check_build_orders()
+
     print("Copying sc2 folder from site packages...")
 
     print(f"Zipping files and directories to {zipfile_name}...")
     # copy everything we need into a zip file
-    zip_files_and_directories(zipfile_name)
+    if args.bytecode:
+        print(
+            f"Compiling bytecode for Python {sys.version_info.major}."
+            f"{sys.version_info.minor}, this must match the ladder's version..."
+        )
+    zip_files_and_directories(zipfile_name, args.bytecode, args.optimize)
+
+    if args.measure:
+        cold_start: float = measure_cold_start(zipfile_name)
+        if args.bytecode:
+            source_zipfile_name: str = f"source_{zipfile_name}"
+            zip_files_and_directories(source_zipfile_name)
+            source_cold_start: float = measure_cold_start(source_zipfile_name)
+            remove(path.join(ROOT_DIRECTORY, source_zipfile_name))
+            remove(path.join(ROOT_DIRECTORY, source_zipfile_name + MANIFEST_SUFFIX))
+            print(f"Cold start from sources: {source_cold_start:.2f}s")
+        print(f"Cold start: {cold_start:.2f}s")
 
     print(f"Cleaning up...")
 
@@ -0,0 +1,127 @@
+"""
+Reports how long `run.py` spends importing modules before the bot can
+connect to the ladder, using `python -X importtime`.
+
+The ladder enforces a startup timeout, so the total is compared against
+STARTUP_IMPORT_BUDGET_MS and the script exits with status 1 when the
+budget is exceeded. Run from the project root:
+
+    python scripts/profile_startup.py
+    python scripts/profile_startup.py --min-ms 1 --top 30
+"""
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from os import path
+from typing import Dict, List
+
+# Median of 5 runs of `--module "sc2.main, sc2.bot_ai, sc2.player,
+# cython_extensions, cython_extensions.dijkstra, numpy, scipy, loguru, yaml"`
+# on one CPU core (1387ms to 1712ms), which is everything `run.py` imports
+# apart from ares and the bot itself
+MEASURED_DEPENDENCY_IMPORT_MS: float = 1508.0
+# Total import time allowed for `import run`, leaving as much again for ares,
+# map_analyzer and the bot. Replace with a measurement of `import run` on the
+# ladder image when one is taken
+STARTUP_IMPORT_BUDGET_MS: float = 2 * MEASURED_DEPENDENCY_IMPORT_MS
+ROOT_DIRECTORY: str = path.abspath(path.join(path.dirname(__file__), ".."))
+IMPORT_TIME_PREFIX: str = "import time:"
+
+
+@dataclass
+class ImportNode:
+    name: str
+    self_us: int
+    cumulative_us: int
+    children: List["ImportNode"] = field(default_factory=list)
+
+
+def profile_imports(module: str) -> List[ImportNode]:
+    """
+    Import `module` in a fresh interpreter and return the import tree.
+    @param module: module to import, as it would be written in an import statement
+    @return: top level imports in the order they happened
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIRECTORY,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        raise RuntimeError(f"Importing '{module}' failed")
+
+    # -X importtime reports a module after everything it imported, children
+    # are indented two spaces deeper than their parent
+    pending: Dict[int, List[ImportNode]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+        self_us, cumulative_us, name = line[len(IMPORT_TIME_PREFIX) :].split("|", 2)
+        if not self_us.strip().isdigit():
+            # column headers
+            continue
+        depth: int = (len(name) - len(name.lstrip()) - 1) // 2
+        node = ImportNode(name.strip(), int(self_us), int(cumulative_us))
+        node.children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def print_tree(nodes: List[ImportNode], min_us: int, depth: int = 0) -> None:
+    for node in sorted(nodes, key=lambda n: n.cumulative_us, reverse=True):
+        if node.cumulative_us < min_us:
+            break
+        print(
+            f"{node.cumulative_us / 1e3:9.1f} {node.self_us / 1e3:9.1f}  "
+            f"{'  ' * depth}{node.name}"
+        )
+        print_tree(node.children, min_us, depth + 1)
+
+
+def flatten(nodes: List[ImportNode]) -> List[ImportNode]:
+    flat: List[ImportNode] = []
+    for node in nodes:
+        flat.append(node)
+        flat.extend(flatten(node.children))
+    return flat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--module", type=str, default="run", help="Module to import")
+    parser.add_argument(
+        "--min-ms",
+        type=float,
+        default=5.0,
+        help="Hide imports with a smaller cumulative time",
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="Number of slowest modules to list"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=STARTUP_IMPORT_BUDGET_MS,
+        help="Fail if the total import time is above this",
+    )
+    args = parser.parse_args()
+
+    roots: List[ImportNode] = profile_imports(args.module)
+    total_ms: float = sum(node.cumulative_us for node in roots) / 1e3
+
+    print(f"{'cumul ms':>9} {'self ms':>9}  module")
+    print_tree(roots, int(args.min_ms * 1e3))
+
+    print(f"\nSlowest {args.top} modules by self time:")
+    for node in sorted(flatten(roots), key=lambda n: n.self_us, reverse=True)[
+        : args.top
+    ]:
+        print(f"{node.self_us / 1e3:9.1f}  {node.name}")
+
+    print(f"\nTotal import time: {total_ms:.1f}ms (budget {args.budget_ms:.0f}ms)")
+    if total_ms > args.budget_ms:
+        print("Startup import budget exceeded")
+        sys.exit(1)
@@ -0,0 +1,120 @@
+"""
+Validates every build in a builds file, zerg_builds.yml by default.
+
+Each OpeningBuildOrder step like "12 drone *2" or "14 spawningpool @ natural"
+is parsed, and its command must resolve to an ares build option, unit type
+or upgrade. Build cycles in BuildChoices must only name builds that exist.
+Run from the project root:
+
+    python scripts/validate_builds.py
+"""
+import argparse
+import sys
+from os import path
+from typing import Dict, List, Optional
+
+import yaml
+from ares.consts import BuildOrderOptions, BuildOrderTargetOptions
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.ids.upgrade_id import UpgradeId
+
+ROOT_DIRECTORY: str = path.abspath(path.join(path.dirname(__file__), ".."))
+BUILDS_FILE: str = "zerg_builds.yml"
+BUILD_CHOICES: str = "BuildChoices"
+BUILDS: str = "Builds"
+CYCLE: str = "Cycle"
+OPENING_BUILD_ORDER: str = "OpeningBuildOrder"
+MULTIPLIER_PREFIX: str = "*"
+TARGET_PREFIX: str = "@"
+
+
+class BuildOrderError(ValueError):
+    pass
+
+
+def resolve_command(command: str) -> None:
+    """
+    Check a build step command refers to something, in the order the build
+    runner looks them up
+    @param command: e.g. "drone", "cancel_gas"
+    """
+    name: str = command.upper()
+    for enum in (BuildOrderOptions, UnitTypeId, UpgradeId):
+        if name in enum.__members__:
+            return
+    raise BuildOrderError(f"unknown command '{command}'")
+
+
+def validate_step(step: Optional[str]) -> None:
+    """
+    Parse a step such as "12 drone *2" or "14 spawningpool @ natural"
+    @param step: step as written in the builds file
+    """
+    if not isinstance(step, str) or not step.strip():
+        raise BuildOrderError(f"empty step {step!r}")
+
+    tokens: List[str] = step.split()
+    if not tokens[0].isdigit():
+        raise BuildOrderError(f"'{step}' doesn't start with a supply count")
+    tokens = tokens[1:]
+
+    if tokens and tokens[-1].startswith(MULTIPLIER_PREFIX):
+        count: str = tokens.pop()[len(MULTIPLIER_PREFIX) :]
+        if not count.isdigit() or int(count) < 1:
+            raise BuildOrderError(f"bad multiplier in '{step}'")
+
+    if TARGET_PREFIX in tokens:
+        index: int = tokens.index(TARGET_PREFIX)
+        target_tokens: List[str] = tokens[index + 1 :]
+        tokens = tokens[:index]
+        if len(target_tokens) != 1:
+            raise BuildOrderError(f"bad target in '{step}'")
+        if target_tokens[0].upper() not in BuildOrderTargetOptions.__members__:
+            raise BuildOrderError(f"unknown target '{target_tokens[0]}' in '{step}'")
+
+    if len(tokens) != 1:
+        raise BuildOrderError(f"expected one command in '{step}'")
+    resolve_command(tokens[0])
+
+
+def validate_builds(builds_config: Dict) -> List[str]:
+    """
+    Check every build in a parsed builds file
+    @param builds_config: contents of the builds file
+    @return: every problem found
+    """
+    errors: List[str] = []
+    builds: Dict = builds_config.get(BUILDS) or {}
+
+    for build_name, build in builds.items():
+        for i, step in enumerate(build.get(OPENING_BUILD_ORDER) or []):
+            try:
+                validate_step(step)
+            except BuildOrderError as e:
+                errors.append(f"{build_name} step {i + 1}: {e}")
+
+    for choice_name, choice in (builds_config.get(BUILD_CHOICES) or {}).items():
+        for build_name in choice.get(CYCLE) or []:
+            if build_name not in builds:
+                errors.append(f"{choice_name} cycles to unknown build '{build_name}'")
+
+    return errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--builds",
+        type=str,
+        default=path.join(ROOT_DIRECTORY, BUILDS_FILE),
+        help="Builds file to validate",
+    )
+    args = parser.parse_args()
+
+    with open(args.builds) as f:
+        problems: List[str] = validate_builds(yaml.safe_load(f))
+    for problem in problems:
+        print(problem)
+    if problems:
+        sys.exit(1)
+    print(f"{args.builds} is valid")
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("sc2")
+
+from sc2.bot_ai_internal import BotAIInternal
+from sc2.ids.ability_id import AbilityId
+from sc2.position import Point2
+from sc2.unit_command import UnitCommand
+
+from bot.command_filter import CommandFilter
+
+
+class Unit(SimpleNamespace):
+    # UnitCommand checks the unit's class name
+    pass
+
+
+def make_filter() -> CommandFilter:
+    abilities = {
+        AbilityId.MOVE_MOVE.value: SimpleNamespace(id=AbilityId.MOVE),
+        AbilityId.ATTACK_ATTACK.value: SimpleNamespace(id=AbilityId.ATTACK),
+    }
+    return CommandFilter(
+        SimpleNamespace(game_data=SimpleNamespace(abilities=abilities))
+    )
+
+
+def make_unit(tag: int, target: Point2) -> Unit:
+    order = SimpleNamespace(
+        ability=SimpleNamespace(id=AbilityId.MOVE, exact_id=AbilityId.MOVE_MOVE),
+        target=target,
+    )
+    return Unit(tag=tag, orders=[order])
+
+
+def test_drops_moves_python_sc2_keeps():
+    unit = make_unit(1, Point2((30.0, 30.0)))
+    action = UnitCommand(AbilityId.MOVE_MOVE, unit, Point2((30.2, 30.1)))
+
+    assert BotAIInternal.prevent_double_actions(action)
+    assert make_filter().filter([action]) == []
+
+
+def test_keeps_moves_outside_tolerance():
+    unit = make_unit(1, Point2((30.0, 30.0)))
+    action = UnitCommand(AbilityId.MOVE_MOVE, unit, Point2((31.0, 30.0)))
+
+    assert make_filter().filter([action]) == [action]
+
+
+def test_keeps_every_command_of_a_unit_given_several():
+    unit = make_unit(1, Point2((30.0, 30.0)))
+    retreat = UnitCommand(AbilityId.MOVE_MOVE, unit, Point2((30.0, 30.0)))
+    attack = UnitCommand(AbilityId.ATTACK_ATTACK, unit, Point2((40.0, 40.0)))
+
+    assert make_filter().filter([retreat, attack]) == [retreat, attack]
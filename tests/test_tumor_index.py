@@ -0,0 +1,92 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("cython_extensions")
+pytest.importorskip("sc2")
+
+from sc2.ids.ability_id import AbilityId
+from sc2.ids.unit_typeid import UnitTypeId
+from sc2.position import Point2
+
+from bot.tumor_index import TumorIndex
+
+
+def make_tumor(tag: int, position: tuple[float, float], type_id: UnitTypeId):
+    return SimpleNamespace(
+        tag=tag, position=Point2(position), type_id=type_id, orders=[]
+    )
+
+
+def make_index(tumors: list, can_spread: set[int]) -> TumorIndex:
+    async def get_available_abilities(units):
+        return [
+            [AbilityId.BUILD_CREEPTUMOR_TUMOR] if u.tag in can_spread else []
+            for u in units
+        ]
+
+    ai = SimpleNamespace(
+        unit_tag_dict={tumor.tag: tumor for tumor in tumors},
+        get_available_abilities=get_available_abilities,
+    )
+    return TumorIndex(ai)
+
+
+def spread(index: TumorIndex, tumors: list) -> None:
+    index.set_spreading(
+        [
+            SimpleNamespace(ability=AbilityId.BUILD_CREEPTUMOR_TUMOR, unit=tumor)
+            for tumor in tumors
+        ]
+    )
+
+
+def test_child_between_two_active_tumors_marks_only_the_parent_spent():
+    parent = make_tumor(1, (20.0, 20.0), UnitTypeId.CREEPTUMORBURROWED)
+    # closer to the child than the parent is
+    sibling = make_tumor(2, (26.0, 20.0), UnitTypeId.CREEPTUMORBURROWED)
+    child = make_tumor(3, (24.0, 20.0), UnitTypeId.CREEPTUMOR)
+    index = make_index([parent, sibling, child], can_spread={sibling.tag})
+    index.add(parent)
+    index.add(sibling)
+    spread(index, index.active_tumors())
+
+    index.add(child)
+    asyncio.run(index.confirm_spent())
+
+    assert [t.tag for t in index.active_tumors()] == [sibling.tag]
+
+
+def test_parent_spent_from_its_order_leaves_a_lone_sibling_active():
+    parent = make_tumor(1, (20.0, 20.0), UnitTypeId.CREEPTUMORBURROWED)
+    sibling = make_tumor(2, (26.0, 20.0), UnitTypeId.CREEPTUMORBURROWED)
+    child = make_tumor(3, (24.0, 20.0), UnitTypeId.CREEPTUMOR)
+    index = make_index([parent, sibling, child], can_spread={sibling.tag})
+    index.add(parent)
+    index.add(sibling)
+    spread(index, index.active_tumors())
+    # the parent is placing its child, the sibling's command didn't go through
+    parent.orders = [SimpleNamespace(ability=AbilityId.BUILD_CREEPTUMOR_TUMOR)]
+    spread(index, index.active_tumors())
+
+    index.add(child)
+    asyncio.run(index.confirm_spent())
+
+    assert [t.tag for t in index.active_tumors()] == [sibling.tag]
+
+
+def test_only_tumors_ordered_to_spread_can_be_the_parent():
+    parent = make_tumor(1, (20.0, 20.0), UnitTypeId.CREEPTUMORBURROWED)
+    # still on cooldown, so it was never ordered to spread
+    waiting = make_tumor(2, (26.0, 20.0), UnitTypeId.CREEPTUMORBURROWED)
+    child = make_tumor(3, (24.0, 20.0), UnitTypeId.CREEPTUMOR)
+    index = make_index([parent, waiting, child], can_spread=set())
+    index.add(parent)
+    index.add(waiting)
+    spread(index, [parent])
+
+    index.add(child)
+    asyncio.run(index.confirm_spent())
+
+    assert [t.tag for t in index.active_tumors()] == [waiting.tag]